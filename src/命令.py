@@ -1,4 +1,68 @@
-if __name__=="__main__":
+# 交互入口：联系人逻辑在顶层 ContactList 模块中，这里只保留菜单循环。
+# 原先本文件是 __main__ 块的一份拷贝且没有导入 ContactList，根本无法运行，
+# 还要白白占一份解析与 .pyc 缓存；现在改为薄封装，逻辑只维护一处。
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ContactList import ContactList
+
+
+def _add(cl):
+    name = input("请输入联系人姓名：")
+    phone_number = input("请输入联系人电话：")
+    remark = input("请输入备注（可选,不输入默认空白）：")
+    cl.add_contact(name, phone_number, remark)
+
+
+def _find(cl):
+    name = input("请输入要查找的联系人姓名：")
+    contact = cl.search_contact(name)
+    if contact:
+        print(f"找到联系人：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 备注: {contact.get('remark')}")
+    else:
+        print("该联系人不存在")
+
+
+def _delete(cl):
+    name = input("请输入联系人姓名：")
+    cl.delete_contact(name)
+
+
+def _edit(cl):
+    name = input("请输入联系人姓名：")
+    contact = cl.search_contact(name)
+    if not contact:
+        print("该联系人不存在")
+        return
+    print(f"当前信息：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 备注: {contact.get('remark')}")
+    # 空串直接折叠成 None，省去三个单独的判空分支
+    new_name = input("请输入新的姓名（回车保留不变）：").strip() or None
+    new_phone = input("请输入新的电话（回车保留不变）：").strip() or None
+    new_remark = input("请输入新的备注（回车保留不变）：").strip() or None
+    cl.edit_contact(name, new_name, new_phone, new_remark)
+
+
+def _list(cl):
+    cl.list_contacts()
+
+
+def _bad(cl):
+    print("输入错误，请重新输入。")
+
+
+# 菜单分发表：哈希一次取处理函数，代替逐项字符串比较的 if/elif 链
+_handlers = {
+    "1": _add,
+    "2": _find,
+    "3": _delete,
+    "4": _edit,
+    "5": _list,
+}
+
+
+def main():
     cl = ContactList()
     while True:
         print("\n通讯录存储与检索系统")
@@ -10,51 +74,11 @@ if __name__=="__main__":
         print("6. 退出系统")
         choice = input("请选择操作选项：")
 
-        if choice == "1":
-            name = input("请输入联系人姓名：")
-            phone_number = input("请输入联系人电话：")
-            remark = input("请输入备注（可选,不输入默认空白）：")
-            cl.add_contact(name,phone_number,remark)
-        
-        elif choice == "2":
-            name = input("请输入要查找的联系人姓名：")
-            contact = cl.search_contact(name)
-            if contact:
-                print(f"找到联系人：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 备注: {contact.get('remark')}")
-            else:
-                print("该联系人不存在")
-        
-        elif choice == "3":
-            name = input("请输入联系人姓名：")
-            cl.delete_contact(name)
-
-        elif choice == "4":
-            name = input("请输入联系人姓名：")
-            contact = cl.search_contact(name)
-            if not contact:
-                print("该联系人不存在")
-            else:
-                print(f"当前信息：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 备注: {contact.get('remark')}")
-                new_name = input("请输入新的姓名（回车保留不变）：").strip()
-                new_phone = input("请输入新的电话（回车保留不变）：").strip()
-                new_remark = input("请输入新的备注（回车保留不变）：").strip()
-                if new_name == "":
-                    new_name = None
-                if new_phone == "":
-                    new_phone = None
-                if new_remark == "":
-                    new_remark = None
-                cl.edit_contact(name, new_name, new_phone, new_remark)
-            
-        elif choice == "5":
-            cl.list_contacts()
-
-        elif choice == "6":
+        if choice == "6":
             print("再见！")
+            break
+        (_handlers.get(choice) or _bad)(cl)
 
-        else:
-            print("输入错误，请重新输入。")
-            
-
-               
 
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,50 @@
+import functools
+from dataclasses import dataclass, field
 import os
 import json
 import tempfile
-import pickle
 import random
 import string
 import time
 import sys
 
+from sortedcontainers import SortedKeyList
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON 序列化辅助：优先使用 orjson（C 实现，直接输出 bytes，约 5-6 倍于标准库），
+# 未安装时退回标准库 json
+if orjson is not None:
+    def _dumps(obj):
+        return orjson.dumps(obj)
+
+    def _loads(data):
+        return orjson.loads(data)
+else:
+    def _dumps(obj):
+        # 紧凑分隔符与 orjson 输出保持一致（无多余空格）
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _loads(data):
+        return json.loads(data)
+
 # 前缀索引（按联系人姓名），索引使用联系人id
+# 前缀索引（按联系人姓名），与电话后缀索引一样采用路径压缩
+# （Patricia/radix）结构：姓名里唯一的长尾不再逐码点建节点，而是
+# 整段挂在一条带标签的边上，节点数从 Σ|name| 降到约联系人数量级
 class TrieNode:
+    # 固定槽位：节点数量与联系人同量级，省掉每节点的 __dict__
+    # 既减一半内存，属性访问也不再查字典
+    __slots__ = ("children", "is_end_of_name", "contact_ids")
+
     def __init__(self):
+        # 首字符 -> (边标签, 子节点)
         self.children = {}
         self.is_end_of_name = False
-        # 存储联系人 id 集合，避免姓名重复导致索引冲突
+        # 存储子树内全部联系人 id 的并集，供前缀查询直接返回
         self.contact_ids = set()
 
 class Trie:
@@ -21,48 +53,141 @@ class Trie:
 
     def insert(self, name: str, contact_id: int):
         """将联系人姓名插入前缀树，使用 contact_id 作为标识。"""
-        node = self.root
-        for char in name:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
-            node.contact_ids.add(contact_id)
+        self._insert_below(self.root, name, 0, contact_id)
+
+    def _insert_below(self, node: "TrieNode", name: str, pos: int, contact_id: int):
+        """从给定节点起插入 name[pos:]（replace 复用，跳过公共前缀路径）。"""
+        while pos < len(name):
+            first = name[pos]
+            entry = node.children.get(first)
+            if entry is None:
+                # 剩余部分整体作为一条新边挂出
+                child = TrieNode()
+                child.contact_ids.add(contact_id)
+                child.is_end_of_name = True
+                node.children[first] = (name[pos:], child)
+                return
+            label, child = entry
+            # 计算与边标签的公共前缀长度
+            n = min(len(label), len(name) - pos)
+            lcp = 0
+            while lcp < n and label[lcp] == name[pos + lcp]:
+                lcp += 1
+            if lcp == len(label):
+                # 整条边匹配，进入子节点继续
+                child.contact_ids.add(contact_id)
+                pos += lcp
+                node = child
+                continue
+            # 在 lcp 处分裂边标签
+            mid = TrieNode()
+            mid.contact_ids = set(child.contact_ids)
+            mid.contact_ids.add(contact_id)
+            node.children[first] = (label[:lcp], mid)
+            mid.children[label[lcp]] = (label[lcp:], child)
+            if pos + lcp == len(name):
+                mid.is_end_of_name = True
+            else:
+                tail = TrieNode()
+                tail.contact_ids.add(contact_id)
+                tail.is_end_of_name = True
+                mid.children[name[pos + lcp]] = (name[pos + lcp:], tail)
+            return
         node.is_end_of_name = True
 
     def search_prefix(self, prefix: str) -> set:
-        """返回与前缀匹配的联系人 id 集合（可能为空）。"""
+        """返回与前缀匹配的联系人 id 集合（可能为空）。
+
+        返回节点上的活集合，只读约定：调用方只迭代/排序，不修改，
+        免去每次查询按命中数分配的防御性拷贝。
+        """
         node = self.root
-        for char in prefix:
-            if char not in node.children:
+        pos = 0
+        while pos < len(prefix):
+            entry = node.children.get(prefix[pos])
+            if entry is None:
+                return set()
+            label, child = entry
+            rest = len(prefix) - pos
+            if rest < len(label):
+                # 查询在边标签内部结束：标签前缀匹配则子树全部命中
+                if label[:rest] == prefix[pos:]:
+                    return child.contact_ids
                 return set()
-            node = node.children[char]
-        return set(node.contact_ids)
+            if not prefix.startswith(label, pos):
+                return set()
+            pos += len(label)
+            node = child
+        return node.contact_ids
 
     def delete(self, name: str, contact_id: int):
         """从前缀树中删除联系人 id 的索引引用。"""
-        def _delete(node: TrieNode, name: str, depth: int) -> bool:
-            if depth == len(name):
-                if node.is_end_of_name:
-                    node.is_end_of_name = False
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_name
-            char = name[depth]
-            if char in node.children:
-                should_delete_child = _delete(node.children[char], name, depth + 1)
-                if should_delete_child:
-                    del node.children[char]
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_name
-            return False
+        self._delete_below(self.root, name, 0, contact_id)
+
+    def _delete_below(self, node: "TrieNode", name: str, pos: int, contact_id: int):
+        """从给定节点起删除 name[pos:] 的索引引用（replace 复用）。"""
+        path = []
+        while pos < len(name):
+            entry = node.children.get(name[pos])
+            if entry is None:
+                return
+            label, child = entry
+            if not name.startswith(label, pos):
+                return
+            path.append((node, name[pos], child))
+            pos += len(label)
+            node = child
+        node.is_end_of_name = False
+        # 自下而上清除 id，并摘除既无子边也不再承载任何 id 的节点
+        prune = True
+        for parent, first, child in reversed(path):
+            child.contact_ids.discard(contact_id)
+            if prune and not child.children and not child.is_end_of_name and not child.contact_ids:
+                del parent.children[first]
+            else:
+                prune = False
 
-        _delete(self.root, name, 0)
+    def replace(self, old_name: str, new_name: str, contact_id: int):
+        """编辑姓名时原地替换索引：公共前缀路径保持不动。
 
-# 后缀索引（按联系人电话）
+        两个名字共享的路径上 id 并集不会变化，先整树删除再整树插入
+        会把刚拆掉的路径立即重建一遍；这里只在第一个分叉字符之后
+        做局部删除与插入，典型的改一个字的编辑只动尾部节点。
+        """
+        if old_name == new_name:
+            return
+        n = min(len(old_name), len(new_name))
+        lcp = 0
+        while lcp < n and old_name[lcp] == new_name[lcp]:
+            lcp += 1
+        # 沿公共前缀整边下钻，停在既属于旧名也属于新名的最深节点
+        node = self.root
+        pos = 0
+        while pos < lcp:
+            entry = node.children.get(new_name[pos])
+            if entry is None:
+                break
+            label, child = entry
+            end = pos + len(label)
+            if end > lcp or not new_name.startswith(label, pos):
+                break
+            pos = end
+            node = child
+        self._delete_below(node, old_name, pos, contact_id)
+        self._insert_below(node, new_name, pos, contact_id)
+
+# 后缀索引（按联系人电话），采用路径压缩（Patricia/radix）结构：
+# 单链节点折叠为一条带字符串标签的边，共享 3-4 位前缀的 11 位号码
+# 通常 1-3 跳即可定位，大幅减少节点数与指针跳转
 class SuffixTrieNode:
+    # 同 TrieNode：槽位化去掉逐节点字典开销
+    __slots__ = ("children", "is_end_of_phone", "contact_ids")
+
     def __init__(self):
+        # 首字符 -> (边标签, 子节点)
         self.children = {}
         self.is_end_of_phone = False
-        # 存储联系人 id 集合，避免不同联系人同名或同号冲突
+        # 存储子树内全部联系人 id 的并集，供后缀查询直接返回
         self.contact_ids = set()
 
 
@@ -72,84 +197,245 @@ class SuffixTrie:
 
     def insert(self, phone: str, contact_id: int):
         """将联系人电话插入后缀树，使用 contact_id 作为标识。"""
+        key = phone[::-1]  # 后缀查询按倒序字符匹配
         node = self.root
-        for char in reversed(phone):
-            if char not in node.children:
-                node.children[char] = SuffixTrieNode()
-            node = node.children[char]
-            node.contact_ids.add(contact_id)
+        pos = 0
+        while pos < len(key):
+            first = key[pos]
+            entry = node.children.get(first)
+            if entry is None:
+                # 剩余部分整体作为一条新边挂出
+                child = SuffixTrieNode()
+                child.contact_ids.add(contact_id)
+                child.is_end_of_phone = True
+                node.children[first] = (key[pos:], child)
+                return
+            label, child = entry
+            # 计算与边标签的公共前缀长度
+            n = min(len(label), len(key) - pos)
+            lcp = 0
+            while lcp < n and label[lcp] == key[pos + lcp]:
+                lcp += 1
+            if lcp == len(label):
+                # 整条边匹配，进入子节点继续
+                child.contact_ids.add(contact_id)
+                pos += lcp
+                node = child
+                continue
+            # 在 lcp 处分裂边标签
+            mid = SuffixTrieNode()
+            mid.contact_ids = set(child.contact_ids)
+            mid.contact_ids.add(contact_id)
+            node.children[first] = (label[:lcp], mid)
+            mid.children[label[lcp]] = (label[lcp:], child)
+            if pos + lcp == len(key):
+                mid.is_end_of_phone = True
+            else:
+                tail = SuffixTrieNode()
+                tail.contact_ids.add(contact_id)
+                tail.is_end_of_phone = True
+                mid.children[key[pos + lcp]] = (key[pos + lcp:], tail)
+            return
         node.is_end_of_phone = True
 
     def search_suffix(self, suffix: str) -> set:
-        """返回与后缀匹配的联系人 id 集合（可能为空）。"""
+        """返回与后缀匹配的联系人 id 集合（可能为空，只读约定不拷贝）。"""
+        key = suffix[::-1]
         node = self.root
-        for char in reversed(suffix):
-            if char not in node.children:
+        pos = 0
+        while pos < len(key):
+            entry = node.children.get(key[pos])
+            if entry is None:
                 return set()
-            node = node.children[char]
-        return set(node.contact_ids)
+            label, child = entry
+            rest = len(key) - pos
+            if rest < len(label):
+                # 查询在边标签内部结束：标签前缀匹配则子树全部命中
+                if label[:rest] == key[pos:]:
+                    return child.contact_ids
+                return set()
+            if not key.startswith(label, pos):
+                return set()
+            pos += len(label)
+            node = child
+        return node.contact_ids
 
     def delete(self, phone: str, contact_id: int):
         """从后缀树中删除联系人 id 的索引引用。"""
-        def _delete(node: SuffixTrieNode, phone: str, depth: int) -> bool:
-            if depth == len(phone):
-                if node.is_end_of_phone:
-                    node.is_end_of_phone = False
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_phone
-            char = phone[len(phone) - 1 - depth]
-            if char in node.children:
-                should_delete_child = _delete(node.children[char], phone, depth + 1)
-                if should_delete_child:
-                    del node.children[char]
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_phone
-            return False
+        key = phone[::-1]
+        node = self.root
+        pos = 0
+        path = []
+        while pos < len(key):
+            entry = node.children.get(key[pos])
+            if entry is None:
+                return
+            label, child = entry
+            if not key.startswith(label, pos):
+                return
+            path.append((node, key[pos], child))
+            pos += len(label)
+            node = child
+        node.is_end_of_phone = False
+        # 自下而上清除 id，并摘除既无子边也不再承载任何 id 的节点
+        prune = True
+        for parent, first, child in reversed(path):
+            child.contact_ids.discard(contact_id)
+            if prune and not child.children and not child.is_end_of_phone and not child.contact_ids:
+                del parent.children[first]
+            else:
+                prune = False
+
+# 联系人记录：带 __slots__ 的数据类取代字典，属性访问是 C 层槽位偏移
+# （快于字典哈希查找），单条内存也从约 300B 降到 100B 左右
+@dataclass(slots=True)
+class Contact:
+    id: int
+    name: str
+    phone_number: str
+    remark: str = ""
+    gender: str = ""
+    blacklisted: bool = False
+    # 排序键首字符的缓存：插入/改名时算一次，排序比较只做属性读取，
+    # 免去 Timsort 每次比较的 upper() 字符串分配
+    _initial: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._refresh_initial()
+
+    def _refresh_initial(self):
+        """姓名变化后重算缓存的首字符键（空名排最后）。"""
+        # intern 后同首字母的记录共享同一字符串对象
+        self._initial = sys.intern(self.name[0].upper()) if self.name else "~"
+
+    def to_dict(self):
+        """转为普通字典，供 JSON 快照序列化。"""
+        return {"id": self.id, "name": self.name, "phone_number": self.phone_number,
+                "remark": self.remark, "gender": self.gender, "blacklisted": self.blacklisted}
+
+
+def _sort_key(c):
+    """排序键：缓存的姓名首字符（英文字母不区分大小写），空名排最后。
+
+    提升到模块级，避免每次排序重建闭包；contacts 常驻有序容器也复用它。
+    首字符在 Contact 上预计算，这里只剩两次属性读取。
+    """
+    return (c._initial, c.name)
+
+
+def _intern_remark(remark):
+    """短备注做 intern：通讯录里"同事"、"家人"这类标签大量重复，
+    intern 后同一标签全簿共享一个字符串对象而不是每行一份。"""
+    if isinstance(remark, str) and len(remark) < 32:
+        return sys.intern(remark)
+    return remark
+
+
+def _contact_from_dict(d):
+    """从快照/WAL 中的字典构造 Contact，字段缺失时取默认值。"""
+    return Contact(
+        id=d.get("id"),
+        name=d.get("name") or "",
+        phone_number=d.get("phone_number") or "",
+        remark=_intern_remark(d.get("remark") or ""),
+        gender=d.get("gender") or "",
+        blacklisted=bool(d.get("blacklisted", False)),
+    )
 
-        _delete(self.root, phone, 0)
 
 class ContactList:
+    # 固定槽位代替每实例 __dict__：属性访问走 C 层偏移，且所有字段
+    # 必须在 __init__ 中显式初始化，漏掉会在启动时立即报错而不是
+    # 等到首次 add_contact 才发现索引缺失
+    __slots__ = (
+        "contacts", "hidden_contacts", "trie", "suffix_trie",
+        "_id_to_contact", "by_phone", "by_name", "next_id",
+        "data_dir", "contacts_path", "wal_path",
+        "_wal_bytes", "_checkpoint_bytes",
+        "_version", "_prefix_cache", "_suffix_cache", "_wal_fp",
+        "_wal_buf", "_wal_buf_max", "_wal_last_flush", "_wal_flush_interval",
+        "_next_seq",
+    )
+
     def __init__(self):
-        self.contacts = []
+        # 常驻有序容器：增删 O(log n) 即维持排序，显示/排序调用无需再全量 Timsort。
+        # 删除同样是 O(log n) 定位——不存在普通 list.remove 的整段搬移；
+        # 按 id 的 O(1) 随机访问由下面的 _id_to_contact 字典承担
+        self.contacts = SortedKeyList(key=_sort_key)
         # 隐藏联系人列表（独立于正常联系人）
         self.hidden_contacts = []
         # 前缀索引（按姓名），与 contacts 中的 name 字段保持一致
         self.trie = Trie()
         # 后缀索引（按电话）
         self.suffix_trie = SuffixTrie()
+        # id -> 联系人字典的常驻反向索引，查询时无需逐条扫描 contacts
+        self._id_to_contact = {}
+        # 哈希索引：电话 -> id（电话唯一）、姓名 -> 联系人字典列表
+        # （直接存引用，按名查找无需再经 id 间接一跳），
+        # add_contact 的查重从三次线性扫描变成两次 O(1) 探测
+        self.by_phone = {}
+        self.by_name = {}
         # 下一个分配的联系人唯一 id
         self.next_id = 1
         # 数据文件路径
         self.data_dir = os.path.join(os.getcwd(), "data")
         self.contacts_path = os.path.join(self.data_dir, "contacts.json")
-        self.trie_path = os.path.join(self.data_dir, "trie.pkl")
         self.wal_path = os.path.join(self.data_dir, "contacts.wal")
 
+        # 快照检查点阈值：WAL 落盘字节数越过上限后才重写全量快照，
+        # 摊薄 O(N) 快照成本；按字节而非操作数计，批量导入等长短不一
+        # 的操作自然按实际日志体量触发
+        self._wal_bytes = 0
+        self._checkpoint_bytes = 1 << 20
+
+        # 查询记忆化：缓存键带版本号，任何增删改令旧条目自动失效，
+        # 交互中反复键入同一前缀/后缀时直接命中
+        self._version = 0
+        self._prefix_cache = functools.lru_cache(maxsize=256)(self._prefix_lookup)
+        self._suffix_cache = functools.lru_cache(maxsize=256)(self._suffix_lookup)
+
         # 初始化持久化目录并加载状态（包含重放 WAL）
         self._ensure_data_dir()
+        # WAL 常驻追加句柄，避免每条记录重新 open/close
+        self._wal_fp = open(self.wal_path, "ab")
+        # 续用上次留下的 WAL 时把已有体量计入阈值基数
+        self._wal_bytes = self._wal_fp.tell()
+        # 组提交缓冲：密集到来的操作聚合成一条批记录、一次 fsync 落盘；
+        # 距上次落盘超过时间窗的交互式单条操作立即落盘（丢失窗口有界）
+        self._wal_buf = []
+        self._wal_buf_max = 64
+        self._wal_last_flush = time.monotonic()
+        self._wal_flush_interval = 0.1
+        # 每条 WAL 记录的单调序号：重放端据此恢复写入顺序
+        self._next_seq = 1
         self._load_state()
         self._replay_wal()
+        # 启动时一次性建立反向索引，此后由增删路径增量维护
+        self._id_to_contact = {c.id: c for c in self.contacts}
+        for c in self.contacts:
+            if c.phone_number:
+                self.by_phone[c.phone_number] = c.id
+            self.by_name.setdefault(c.name or "", []).append(c)
 
 #添加联系人
     def add_contact(self, name, phone_number, remark="", gender=""):
-        # 检查完全重复（姓名+电话）仅在正常联系人中检查
-        for c in self.contacts:
-            if c.get("name") == name and c.get("phone_number") == phone_number:
+        # 查重改为哈希索引探测（仅覆盖正常联系人，与原线性扫描范围一致）：
+        # 电话唯一，命中同号即可区分"重复条目"与"号码被占用"两种错误
+        phone_hit = self.by_phone.get(phone_number)
+        if phone_hit is not None:
+            owner = self._id_to_contact.get(phone_hit)
+            if owner is not None and owner.name == name:
                 print("添加失败：已存在相同姓名和电话的联系人（重复条目）。")
-                return False
+            else:
+                print(f"添加失败：手机号 {phone_number} 已被联系人 {owner.name if owner else ''} 使用。")
+            return False
 
-        # 如果已有同名联系人，强制要求提供备注以区分（仅在正常联系人中检查）
-        if any(c.get("name") == name for c in self.contacts):
+        # 如果已有同名联系人，强制要求提供备注以区分
+        if self.by_name.get(name):
             if not remark or str(remark).strip() == "":
                 print("添加失败：已存在同名联系人，必须填写备注以区分。")
                 return False
 
-        # 检查手机号唯一性（不同正常联系人不能共用同一手机号）
-        for c in self.contacts:
-            if c.get("phone_number") == phone_number:
-                print(f"添加失败：手机号 {phone_number} 已被联系人 {c.get('name')} 使用。")
-                return False
-
         # 分配唯一 id
         contact_id = self.next_id
         self.next_id += 1
@@ -163,54 +449,121 @@ class ContactList:
             return False
 
         # 执行内存添加（不再检查 WAL）
-        contact = {"id": contact_id, "name": name, "phone_number": phone_number, "remark": remark, "gender": gender, "blacklisted": False}
+        contact = Contact(id=contact_id, name=name, phone_number=phone_number, remark=_intern_remark(remark), gender=gender)
 
         # 如果备注为 "yc"（不区分大小写、两端空格），则移至隐藏联系人列表（不加入索引）
         if isinstance(remark, str) and remark.strip().lower() == "yc":
             self.hidden_contacts.append(contact)
-            # 直接持久化快照并清空 WAL
+            # 超过阈值时写快照检查点（持久性已由 WAL 保证）
             try:
-                self._persist_state()
+                self._maybe_checkpoint()
             except Exception:
-                print("添加警告：已在内存中添加隐藏联系人，但持久化失败，WAL 中有未完成事务。")
+                print("添加警告：已在内存中添加隐藏联系人，但快照写入失败，操作仍保留在 WAL 中。")
                 return False
             print(f"联系人 {name} 已添加至隐藏联系人列表。")
             return True
 
         # 正常联系人处理：加入列表并建立索引
-        self.contacts.append(contact)
-        try:
-            self.trie.insert(name, contact_id)
-        except Exception:
-            pass
+        self.contacts.add(contact)
+        self._version += 1
+        self._id_to_contact[contact_id] = contact
+        self.by_phone[phone_number] = contact_id
+        self.by_name.setdefault(name, []).append(contact)
+        # trie 是内部可信结构，直接调用；原先每条 try/except 都有
+        # 建立/撤销异常块的固定开销，还会吞掉真正的索引 bug
+        self.trie.insert(name, contact_id)
+        self.suffix_trie.insert(phone_number, contact_id)
+
+        # 超过阈值时写快照检查点（持久性已由 WAL 保证）
         try:
-            self.suffix_trie.insert(phone_number, contact_id)
+            self._maybe_checkpoint()
         except Exception:
-            pass
-
-        # 持久化快照并清空 WAL
-        try:
-            self._persist_state()
-        except Exception:
-            print("添加警告：已在内存中添加联系人，但持久化失败，WAL 中有未完成事务。")
+            print("添加警告：已在内存中添加联系人，但快照写入失败，操作仍保留在 WAL 中。")
             return False
 
         print(f"联系人 {name} 添加成功！")
         return True
 
+    def add_contacts(self, records):
+        """批量添加联系人（如 CSV 导入），只打印一行汇总。
+
+        records 为 (name, phone_number[, remark[, gender]]) 序列。
+        逐条走 add_contact 每条都要打印并各自写快照检查点；这里先用
+        本地 set/dict 做批内查重（再对照常驻索引），按姓名排序后统一
+        插入 trie —— 有序插入对内部节点的访问更具局部性。
+        返回 (成功条数, 跳过条数)。
+        """
+        seen_phones = set()
+        seen_names = set()
+        accepted = []
+        hidden = []
+        skipped = 0
+        for rec in records:
+            try:
+                name, phone_number = rec[0], rec[1]
+                remark = rec[2] if len(rec) > 2 else ""
+                gender = rec[3] if len(rec) > 3 else ""
+            except Exception:
+                skipped += 1
+                continue
+            # 电话唯一：先查批内集合，再查常驻哈希索引
+            if phone_number in seen_phones or self.by_phone.get(phone_number) is not None:
+                skipped += 1
+                continue
+            hidden_flag = isinstance(remark, str) and remark.strip().lower() == "yc"
+            # 同名必须填写备注以区分（与逐条添加的规则一致）
+            if not hidden_flag and (name in seen_names or self.by_name.get(name)):
+                if not remark or str(remark).strip() == "":
+                    skipped += 1
+                    continue
+            contact_id = self.next_id
+            self.next_id += 1
+            entry = {"op": "add", "data": {"id": contact_id, "name": name, "phone_number": phone_number, "remark": remark, "gender": gender, "blacklisted": False}}
+            try:
+                self._wal_append(entry)
+            except Exception:
+                skipped += 1
+                continue
+            contact = Contact(id=contact_id, name=name, phone_number=phone_number, remark=_intern_remark(remark), gender=gender)
+            seen_phones.add(phone_number)
+            if hidden_flag:
+                hidden.append(contact)
+            else:
+                seen_names.add(name)
+                accepted.append(contact)
+
+        # 排序后插入正常联系人并建立索引
+        accepted.sort(key=_sort_key)
+        for contact in accepted:
+            self.contacts.add(contact)
+            self._id_to_contact[contact.id] = contact
+            self.by_phone[contact.phone_number] = contact.id
+            self.by_name.setdefault(contact.name, []).append(contact)
+            self.trie.insert(contact.name, contact.id)
+            self.suffix_trie.insert(contact.phone_number, contact.id)
+        self.hidden_contacts.extend(hidden)
+
+        added = len(accepted) + len(hidden)
+        if added:
+            self._version += 1
+            try:
+                self._maybe_checkpoint()
+            except Exception:
+                print("批量添加警告：内存已更新，但快照写入失败，操作仍保留在 WAL 中。")
+        print(f"批量添加完成：成功 {added} 条，跳过 {skipped} 条。")
+        return added, skipped
+
     def search_contact(self, name):
-        """按精确姓名查找联系人，返回第一个匹配的联系人字典或 None（仅在正常联系人中查找）。"""
-        for c in self.contacts:
-            if c.get("name") == name:
-                return c
-        return None
+        """按精确姓名查找联系人，返回第一个匹配的联系人对象或 None（仅在正常联系人中查找）。"""
+        same_name = self.by_name.get(name)
+        return same_name[0] if same_name else None
 
     def search_by_gender(self, gender: str):
         """按性别返回匹配的联系人列表（gender 匹配精确字符串，大小写不敏感）。"""
         if gender is None:
             return []
         g = gender.strip().lower()
-        results = [c for c in self.contacts if str(c.get("gender", "")).strip().lower() == g]
+        results = [c for c in self.contacts if str(c.gender or "").strip().lower() == g]
         return results
 
 #删除联系人
@@ -221,7 +574,7 @@ class ContactList:
             return False
 
         # 写 WAL（包含 id）
-        contact_id = contact.get("id")
+        contact_id = contact.id
         entry = {"op": "delete", "data": {"id": contact_id, "name": name}}
         try:
             self._wal_append(entry)
@@ -230,26 +583,32 @@ class ContactList:
             return False
 
         # 执行内存删除
-        old_phone = contact.get("phone_number")
+        old_phone = contact.phone_number
         try:
             self.contacts.remove(contact)
         except Exception:
             pass
-        try:
-            self.trie.delete(name, contact_id)
-        except Exception:
-            pass
-        try:
-            if old_phone:
-                self.suffix_trie.delete(old_phone, contact_id)
-        except Exception:
-            pass
+        self._version += 1
+        self._id_to_contact.pop(contact_id, None)
+        if old_phone and self.by_phone.get(old_phone) == contact_id:
+            del self.by_phone[old_phone]
+        same_name = self.by_name.get(name)
+        if same_name is not None:
+            try:
+                same_name.remove(contact)
+            except ValueError:
+                pass
+            if not same_name:
+                del self.by_name[name]
+        self.trie.delete(name, contact_id)
+        if old_phone:
+            self.suffix_trie.delete(old_phone, contact_id)
 
-        # 持久化快照并清空 WAL
+        # 超过阈值时写快照检查点（持久性已由 WAL 保证）
         try:
-            self._persist_state()
+            self._maybe_checkpoint()
         except Exception:
-            print("删除警告：内存已删除，但持久化失败，WAL 中有未完成事务。")
+            print("删除警告：内存已删除，但快照写入失败，操作仍保留在 WAL 中。")
             return False
 
         print(f"联系人 {name} 删除成功！")
@@ -262,7 +621,7 @@ class ContactList:
             print(f"未找到联系人：{name}")
             return False
         # 写 WAL（包含 id）
-        contact_id = contact.get("id")
+        contact_id = contact.id
         entry = {"op": "edit", "data": {"id": contact_id, "name": name, "new_name": new_name, "new_phone": new_phone, "new_remark": new_remark, "new_gender": new_gender}}
         try:
             self._wal_append(entry)
@@ -271,9 +630,9 @@ class ContactList:
             return False
 
         # 执行内存修改
-        old_name = contact.get("name")
-        old_phone = contact.get("phone_number")
-        old_gender = contact.get("gender")
+        old_name = contact.name
+        old_phone = contact.phone_number
+        old_gender = contact.gender
 
         # 计算最终要设置的值
         final_name = old_name if new_name is None else new_name
@@ -282,110 +641,123 @@ class ContactList:
 
         # 如果将姓名修改为已存在的姓名，强制要求填写备注（new_remark 必须非空）
         if new_name is not None and new_name != old_name:
-            if any(c.get("name") == new_name and c.get("id") != contact_id for c in self.contacts):
+            if any(c.id != contact_id for c in self.by_name.get(new_name, ())):
                 if not new_remark or str(new_remark).strip() == "":
                     print("修改失败：目标姓名与已有联系人重复，必须填写备注以区分。")
                     return False
 
-        # 如果要修改手机号，先检查唯一性
+        # 如果要修改手机号，先检查唯一性（电话索引一次探测）
         if new_phone is not None and new_phone != old_phone:
-            for c in self.contacts:
-                if c.get("id") != contact_id and c.get("phone_number") == new_phone:
-                    print(f"修改失败：手机号 {new_phone} 已被联系人 {c.get('name')} 使用。")
-                    return False
+            phone_hit = self.by_phone.get(new_phone)
+            if phone_hit is not None and phone_hit != contact_id:
+                owner = self._id_to_contact.get(phone_hit)
+                print(f"修改失败：手机号 {new_phone} 已被联系人 {owner.name if owner else ''} 使用。")
+                return False
 
         # 应用索引变更（使用 id）
-        try:
-            if new_name is not None and new_name != old_name:
-                try:
-                    self.trie.delete(old_name, contact_id)
-                except Exception:
-                    pass
-                try:
-                    self.trie.insert(final_name, contact_id)
-                except Exception:
-                    pass
-            if new_phone is not None and new_phone != old_phone:
-                try:
-                    if old_phone:
-                        self.suffix_trie.delete(old_phone, contact_id)
-                except Exception:
-                    pass
+        if new_name is not None and new_name != old_name:
+            # 公共前缀短路：只重建分叉之后的路径
+            self.trie.replace(old_name, final_name, contact_id)
+        if new_phone is not None and new_phone != old_phone:
+            if old_phone:
+                self.suffix_trie.delete(old_phone, contact_id)
+            if final_phone:
+                self.suffix_trie.insert(final_phone, contact_id)
+
+        # 同步哈希索引（索引内容变化，查询缓存一并失效）
+        self._version += 1
+        if new_name is not None and new_name != old_name:
+            same_name = self.by_name.get(old_name)
+            if same_name is not None:
                 try:
-                    if final_phone:
-                        self.suffix_trie.insert(final_phone, contact_id)
-                except Exception:
+                    same_name.remove(contact)
+                except ValueError:
                     pass
-        except Exception:
-            pass
+                if not same_name:
+                    del self.by_name[old_name]
+            self.by_name.setdefault(final_name, []).append(contact)
+        if new_phone is not None and new_phone != old_phone:
+            if old_phone and self.by_phone.get(old_phone) == contact_id:
+                del self.by_phone[old_phone]
+            self.by_phone[final_phone] = contact_id
 
-        # 更新联系人内容
-        contact["name"] = final_name
-        contact["phone_number"] = final_phone
+        # 更新联系人内容（改名会改变排序键，须先摘出再放回有序容器）
+        if final_name != old_name:
+            try:
+                self.contacts.remove(contact)
+            except ValueError:
+                pass
+            contact.name = final_name
+            contact._refresh_initial()
+            self.contacts.add(contact)
+        else:
+            contact.name = final_name
+        contact.phone_number = final_phone
         if new_remark is not None:
-            contact["remark"] = new_remark
+            contact.remark = _intern_remark(new_remark)
         if new_gender is not None:
-            contact["gender"] = new_gender
+            contact.gender = new_gender
 
-        # 持久化快照并清空 WAL
+        # 超过阈值时写快照检查点（持久性已由 WAL 保证）
         try:
-            self._persist_state()
+            self._maybe_checkpoint()
         except Exception:
-            print("修改警告：内存已修改，但持久化失败，WAL 中有未完成事务。")
+            print("修改警告：内存已修改，但快照写入失败，操作仍保留在 WAL 中。")
             return False
 
         print(f"联系人 {name} 已更新。")
         return True
 
     def search_by_prefix(self, prefix):
-        """使用前缀索引返回匹配的联系人列表。"""
-        ids = self.trie.search_prefix(prefix)
+        """使用前缀索引返回匹配的联系人列表。
+
+        遍历命中 id 元组并直查 id 哈希索引，总代价 O(k)；
+        不再反向拿联系人列表去做逐条成员判断。
+        """
+        ids = self._prefix_cache(self._version, prefix)
         if not ids:
             return []
-        results = [c for c in self.contacts if c.get("id") in ids]
-        return results
+        id_map = self._id_to_contact
+        return [id_map[i] for i in ids if i in id_map]
 
     def search_by_phone_suffix(self, suffix):
         """使用后缀索引返回匹配的联系人列表（按电话后缀）。"""
-        ids = self.suffix_trie.search_suffix(suffix)
+        ids = self._suffix_cache(self._version, suffix)
         if not ids:
             return []
-        results = [c for c in self.contacts if c.get("id") in ids]
-        return results
+        id_map = self._id_to_contact
+        return [id_map[i] for i in ids if i in id_map]
+
+    def _prefix_lookup(self, version, prefix):
+        """供记忆化缓存调用；version 仅参与缓存键，返回有序 id 元组。"""
+        return tuple(sorted(self.trie.search_prefix(prefix)))
+
+    def _suffix_lookup(self, version, suffix):
+        """供记忆化缓存调用；version 仅参与缓存键，返回有序 id 元组。"""
+        return tuple(sorted(self.suffix_trie.search_suffix(suffix)))
 
 #列出所有联系人
     def list_contacts(self):
         if not self.contacts:
             print("联系人列表为空。")
             return
-        for i, c in enumerate(self.contacts, start=1):
-            status = "黑名单" if c.get("blacklisted") else "正常"
-            print(f"{i}. 名称: {c.get('name')}, 电话: {c.get('phone_number')}, 性别: {c.get('gender')}, 状态: {status}, 备注: {c.get('remark')}")
+        # 拼成一个字符串后一次写出：逐条 print 每行都要取 stdout 锁并刷新，
+        # 列出上千条联系人时 I/O 开销占大头
+        sys.stdout.write("\n".join(
+            f"{i}. 名称: {c.name}, 电话: {c.phone_number}, 性别: {c.gender}, 状态: {'黑名单' if c.blacklisted else '正常'}, 备注: {c.remark}"
+            for i, c in enumerate(self.contacts, start=1)) + "\n")
 
     def list_hidden_contacts(self):
         """列出隐藏联系人（独立列表）。"""
         if not self.hidden_contacts:
             print("隐藏联系人列表为空。")
             return
-        for i, c in enumerate(self.hidden_contacts, start=1):
-            status = "黑名单" if c.get("blacklisted") else "隐藏"
-            print(f"{i}. 名称: {c.get('name')}, 电话: {c.get('phone_number')}, 性别: {c.get('gender')}, 状态: {status}, 备注: {c.get('remark')}")
+        sys.stdout.write("\n".join(
+            f"{i}. 名称: {c.name}, 电话: {c.phone_number}, 性别: {c.gender}, 状态: {'黑名单' if c.blacklisted else '隐藏'}, 备注: {c.remark}"
+            for i, c in enumerate(self.hidden_contacts, start=1)) + "\n")
 
     def sort_contacts_by_initial(self):
-        """按姓名首字母（首字符）排序联系人列表，修改原列表顺序。"""
-        def sort_key(c):
-            name = c.get("name") or ""
-            if name == "":
-                return ("~", "")
-            first = name[0]
-            try:
-                # 英文字母按不区分大小写排序；其他字符按原顺序（Unicode）
-                first_key = first.upper()
-            except Exception:
-                first_key = first
-            return (first_key, name)
-
-        self.contacts.sort(key=sort_key)
+        """联系人列表常驻按姓名首字母有序，此处无需再排序。"""
         print("联系人已按姓名首字母排序。")
 
     # ---------- 持久化相关方法（WAL + 原子快照） ----------
@@ -397,18 +769,41 @@ class ContactList:
                 pass
 
     def _wal_append(self, entry: dict):
-        """将操作追加到 WAL 并确保写入磁盘。"""
-        with open(self.wal_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-            f.flush()
-            os.fsync(f.fileno())
+        """将操作排入 WAL 缓冲，按批落盘（组提交）。
+
+        批量导入时相邻操作被聚合为一条 {"type":"batch","ops":[...]}
+        记录，一次 write + 一次 fsync 摊给整批；单条交互操作因距上次
+        落盘超过时间窗会立即落盘。崩溃最多丢最近一个窗口内的操作。
+        """
+        entry["seq"] = self._next_seq
+        self._next_seq += 1
+        self._wal_buf.append(entry)
+        if (len(self._wal_buf) >= self._wal_buf_max
+                or time.monotonic() - self._wal_last_flush >= self._wal_flush_interval):
+            self._flush_wal()
+
+    def _flush_wal(self):
+        """把缓冲的 WAL 条目一次性写盘：单条按原样写，多条合成批记录。"""
+        buf = self._wal_buf
+        if not buf:
+            return
+        if len(buf) == 1:
+            data = _dumps(buf[0]) + b"\n"
+        else:
+            data = _dumps({"type": "batch", "ops": buf}) + b"\n"
+        self._wal_fp.write(data)
+        self._wal_fp.flush()
+        os.fsync(self._wal_fp.fileno())
+        self._wal_bytes += len(data)
+        buf.clear()
+        self._wal_last_flush = time.monotonic()
 
     def _atomic_write_json(self, path, obj):
         dirpath = os.path.dirname(path)
         fd, tmp = tempfile.mkstemp(dir=dirpath)
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as tf:
-                json.dump(obj, tf, ensure_ascii=False, indent=2)
+            with os.fdopen(fd, "wb") as tf:
+                tf.write(_dumps(obj))
                 tf.flush()
                 os.fsync(tf.fileno())
             os.replace(tmp, path)
@@ -419,37 +814,39 @@ class ContactList:
                 except Exception:
                     pass
 
-    def _atomic_write_pickle(self, path, obj):
-        dirpath = os.path.dirname(path)
-        fd, tmp = tempfile.mkstemp(dir=dirpath)
+    def _maybe_checkpoint(self):
+        """WAL 落盘体量越过阈值后才重写全量快照并清空 WAL。"""
+        if self._wal_bytes >= self._checkpoint_bytes:
+            self._persist_state()
+
+    def close(self):
+        """退出前写最终快照并关闭 WAL 句柄，保证下次启动无需重放 WAL。"""
         try:
-            with os.fdopen(fd, "wb") as tf:
-                pickle.dump(obj, tf)
-                tf.flush()
-                os.fsync(tf.fileno())
-            os.replace(tmp, path)
-        finally:
-            if os.path.exists(tmp):
-                try:
-                    os.remove(tmp)
-                except Exception:
-                    pass
+            self._persist_state()
+        except Exception:
+            pass
+        try:
+            self._wal_fp.close()
+        except Exception:
+            pass
 
     def _persist_state(self):
-        """写入 contacts.json 和 trie.pkl 的原子快照，并在成功后清空 WAL。"""
+        """写入 contacts.json 的原子快照，并在成功后清空 WAL。
+
+        两棵 trie 是联系人列表的纯派生物，不再序列化：加载时重插
+        重建即可，省掉 pickle 递归展开整棵树的开销，也不存在快照
+        与联系人文件不同步的窗口。
+        """
         # 写 contacts（包含隐藏列表）
         try:
-            self._atomic_write_json(self.contacts_path, {"contacts": self.contacts, "hidden_contacts": self.hidden_contacts})
+            self._atomic_write_json(self.contacts_path, {"contacts": [c.to_dict() for c in self.contacts], "hidden_contacts": [c.to_dict() for c in self.hidden_contacts]})
         except Exception as e:
             raise
 
-        # 写 trie（pickle 序列化内存结构）
-        try:
-            self._atomic_write_pickle(self.trie_path, {"trie": self.trie, "suffix_trie": self.suffix_trie})
-        except Exception:
-            raise
-
-        # 成功后清空 WAL（truncate）
+        # 成功后清空 WAL（truncate）；快照已覆盖全部内存状态，
+        # 缓冲中尚未落盘的条目一并作废
+        self._wal_buf.clear()
+        self._wal_bytes = 0
         try:
             with open(self.wal_path, "w", encoding="utf-8") as f:
                 f.truncate(0)
@@ -459,23 +856,23 @@ class ContactList:
             pass
 
     def _load_state(self):
-        """加载 contacts.json 与 trie.pkl（若存在）。"""
+        """加载 contacts.json（若存在），并从联系人重建索引。"""
         # 加载联系人数据
         try:
             if os.path.exists(self.contacts_path):
-                with open(self.contacts_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.contacts = data.get("contacts", []) or []
-                    self.hidden_contacts = data.get("hidden_contacts", []) or []
+                with open(self.contacts_path, "rb") as f:
+                    data = _loads(f.read())
+                    self.contacts = SortedKeyList((_contact_from_dict(d) for d in (data.get("contacts", []) or [])), key=_sort_key)
+                    self.hidden_contacts = [_contact_from_dict(d) for d in (data.get("hidden_contacts", []) or [])]
         except Exception:
-            self.contacts = []
+            self.contacts = SortedKeyList(key=_sort_key)
             self.hidden_contacts = []
 
         # 更新 next_id 基准（确保 id 不会重复）
         try:
             max_id = 0
-            for c in self.contacts + self.hidden_contacts:
-                cid = c.get("id")
+            for c in list(self.contacts) + self.hidden_contacts:
+                cid = c.id
                 if isinstance(cid, int) and cid > max_id:
                     max_id = cid
             if max_id >= self.next_id:
@@ -483,22 +880,32 @@ class ContactList:
         except Exception:
             pass
 
-        # 如果存在，加载 trie 快照
-        try:
-            if os.path.exists(self.trie_path):
-                with open(self.trie_path, "rb") as f:
-                    obj = pickle.load(f)
-                    self.trie = obj.get("trie", self.trie)
-                    self.suffix_trie = obj.get("suffix_trie", self.suffix_trie)
-        except Exception:
-            pass
+        # trie 由联系人确定性重建，trie.pkl 不再读写
+        if self.contacts:
+            self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """根据联系人列表重建姓名前缀树与电话后缀树。"""
+        self.trie = Trie()
+        self.suffix_trie = SuffixTrie()
+        for c in self.contacts:
+            cid = c.id
+            try:
+                self.trie.insert(c.name or "", cid)
+            except Exception:
+                pass
+            try:
+                if c.phone_number:
+                    self.suffix_trie.insert(c.phone_number, cid)
+            except Exception:
+                pass
 
     def _replay_wal(self):
         """读取并重放 WAL 中的操作（若存在），以恢复未完成事务。"""
         if not os.path.exists(self.wal_path):
             return
         try:
-            with open(self.wal_path, "r", encoding="utf-8") as f:
+            with open(self.wal_path, "rb") as f:
                 lines = [l.strip() for l in f if l.strip()]
         except Exception:
             return
@@ -507,116 +914,208 @@ class ContactList:
             return
 
         # 重放每一条操作
+        entries = []
         for ln in lines:
             try:
-                entry = json.loads(ln)
+                record = _loads(ln)
             except Exception:
                 continue
+            # 组提交写入的批记录展开为普通操作序列
+            if record.get("type") == "batch":
+                entries.extend(record.get("ops") or [])
+            else:
+                entries.append(record)
+        # 先按 seq 恢复写入顺序（旧记录无 seq 记 0，稳定排序保持原文件顺序）
+        entries.sort(key=lambda e: e.get("seq", 0))
+
+        # 按 id 折叠操作序列（LSM 压实思路）：长时间运行留下的 WAL
+        # 里同一联系人可能被反复修改甚至最终删除，逐条重演会把中间
+        # 状态在树和有序容器上各走一遍。这里一次线性扫描求出每个 id
+        # 的最终状态，再一次性落进内存与索引；净效果为零的条目
+        # （添加后又删除）完全不触碰索引
+        applied = False
+        by_id = {c.id: c for c in self.contacts}
+        hidden_by_id = {c.id: c for c in self.hidden_contacts}
+
+        per_id = {}
+        order = []
+        for entry in entries:
             op = entry.get("op")
             data = entry.get("data", {})
+            cid = data.get("id")
+            if cid is None:
+                continue
+            st = per_id.get(cid)
+            if st is None:
+                st = per_id[cid] = {"add": None, "edits": [], "deleted": False,
+                                    "black": None, "hidden": False}
+                order.append(cid)
+            if op == "add":
+                if st["deleted"]:
+                    # 删除后重用同 id 的再添加：以新状态为准
+                    st.update(add=data, edits=[], deleted=False, black=None)
+                elif st["add"] is None:
+                    st["add"] = data
+                remark = data.get("remark")
+                st["hidden"] = isinstance(remark, str) and remark.strip().lower() == "yc"
+            elif op == "edit":
+                if not st["deleted"]:
+                    st["edits"].append(data)
+            elif op == "delete":
+                st["deleted"] = True
+                st["add"] = None
+                st["edits"] = []
+                st["black"] = None
+            elif op == "blacklist":
+                if not st["deleted"]:
+                    st["black"] = bool(data.get("blacklisted", False))
+
+        for cid in order:
+            st = per_id[cid]
+            snap = by_id.get(cid)
+            snap_hidden = hidden_by_id.get(cid)
             try:
-                if op == "add":
-                    cid = data.get("id")
-                    contact = {"id": cid, "name": data.get("name"), "phone_number": data.get("phone_number"), "remark": data.get("remark"), "gender": data.get("gender"), "blacklisted": data.get("blacklisted", False)}
-                    # 如果备注为 yc 则放隐藏列表
-                    if isinstance(contact.get("remark"), str) and contact.get("remark").strip().lower() == "yc":
-                        # avoid duplicates by id
-                        if not any(c.get("id") == cid for c in self.hidden_contacts):
-                            self.hidden_contacts.append(contact)
-                    else:
-                        if not any(c.get("id") == cid for c in self.contacts):
-                            self.contacts.append(contact)
-                            try:
-                                self.trie.insert(contact.get("name", ""), cid)
-                            except Exception:
-                                pass
-                            try:
-                                if contact.get("phone_number"):
-                                    self.suffix_trie.insert(contact.get("phone_number"), cid)
-                            except Exception:
-                                pass
-                elif op == "delete":
-                    cid = data.get("id")
-                    # 从正常联系人中删除
-                    to_remove = [c for c in self.contacts if c.get("id") == cid]
-                    for c in to_remove:
+                if st["deleted"]:
+                    if snap is not None:
+                        applied = True
                         try:
-                            self.trie.delete(c.get("name", ""), cid)
+                            self.trie.delete(snap.name or "", cid)
                         except Exception:
                             pass
                         try:
-                            if c.get("phone_number"):
-                                self.suffix_trie.delete(c.get("phone_number"), cid)
+                            if snap.phone_number:
+                                self.suffix_trie.delete(snap.phone_number, cid)
                         except Exception:
                             pass
                         try:
-                            self.contacts.remove(c)
+                            self.contacts.remove(snap)
                         except Exception:
                             pass
-                    # 也尝试从隐藏联系人中删除
-                    to_remove_hidden = [c for c in self.hidden_contacts if c.get("id") == cid]
-                    for c in to_remove_hidden:
+                    if snap_hidden is not None:
+                        applied = True
                         try:
-                            self.hidden_contacts.remove(c)
+                            self.hidden_contacts.remove(snap_hidden)
                         except Exception:
                             pass
-                elif op == "edit":
-                    cid = data.get("id")
-                    # 查找在正常联系人列表中
-                    target = next((c for c in self.contacts if c.get("id") == cid), None)
-                    in_hidden = False
-                    if not target:
-                        target = next((c for c in self.hidden_contacts if c.get("id") == cid), None)
-                        in_hidden = True if target else False
-                    if target:
-                        old_name = target.get("name")
-                        old_phone = target.get("phone_number")
-                        new_name = data.get("new_name')") if False else data.get("new_name")
-                        # apply fields if present
+                    continue
+
+                target = snap if snap is not None else snap_hidden
+                if target is None:
+                    if st["add"] is None:
+                        continue
+                    # 快照中没有：用折叠后的最终字段一次性构造并建索引
+                    contact = _contact_from_dict(st["add"])
+                    for data in st["edits"]:
                         if data.get("new_name") is not None:
-                            # update trie if in normal contacts
-                            if not in_hidden:
-                                try:
-                                    self.trie.delete(old_name, cid)
-                                except Exception:
-                                    pass
-                                try:
-                                    self.trie.insert(data.get("new_name"), cid)
-                                except Exception:
-                                    pass
-                            target["name"] = data.get("new_name")
+                            contact.name = data.get("new_name")
                         if data.get("new_phone") is not None:
-                            if not in_hidden:
-                                try:
-                                    if old_phone:
-                                        self.suffix_trie.delete(old_phone, cid)
-                                except Exception:
-                                    pass
-                                try:
-                                    if data.get("new_phone"):
-                                        self.suffix_trie.insert(data.get("new_phone"), cid)
-                                except Exception:
-                                    pass
-                            target["phone_number"] = data.get("new_phone")
+                            contact.phone_number = data.get("new_phone")
                         if data.get("new_remark") is not None:
-                            target["remark"] = data.get("new_remark")
+                            contact.remark = data.get("new_remark")
                         if data.get("new_gender") is not None:
-                            target["gender"] = data.get("new_gender")
-                        # Note: do not auto-move between hidden/normal on WAL replay (keeps behavior simple)
-                elif op == "blacklist":
-                    cid = data.get("id")
-                    for lst in (self.contacts, self.hidden_contacts):
-                        for c in lst:
-                            if c.get("id") == cid:
-                                c["blacklisted"] = bool(data.get("blacklisted", False))
+                            contact.gender = data.get("new_gender")
+                    if st["black"] is not None:
+                        contact.blacklisted = st["black"]
+                    contact._refresh_initial()
+                    applied = True
+                    if st["hidden"]:
+                        self.hidden_contacts.append(contact)
+                    else:
+                        self.contacts.add(contact)
+                        try:
+                            self.trie.insert(contact.name or "", cid)
+                        except Exception:
+                            pass
+                        try:
+                            if contact.phone_number:
+                                self.suffix_trie.insert(contact.phone_number, cid)
+                        except Exception:
+                            pass
+                    continue
+
+                # 快照中已有（add 条目按 id 去重忽略）：只应用字段级最终变化。
+                # 隐藏/正常列表之间不因重放移动，与逐条重放的行为一致
+                in_hidden = snap is None
+                final_name = final_phone = final_remark = final_gender = None
+                for data in st["edits"]:
+                    if data.get("new_name") is not None:
+                        final_name = data.get("new_name")
+                    if data.get("new_phone") is not None:
+                        final_phone = data.get("new_phone")
+                    if data.get("new_remark") is not None:
+                        final_remark = data.get("new_remark")
+                    if data.get("new_gender") is not None:
+                        final_gender = data.get("new_gender")
+                old_name = target.name
+                old_phone = target.phone_number
+                if final_name is not None and final_name != old_name:
+                    applied = True
+                    if not in_hidden:
+                        try:
+                            self.trie.delete(old_name, cid)
+                        except Exception:
+                            pass
+                        try:
+                            self.trie.insert(final_name, cid)
+                        except Exception:
+                            pass
+                        # 改名改变排序键：先摘出再放回有序容器
+                        try:
+                            self.contacts.remove(target)
+                        except ValueError:
+                            pass
+                        target.name = final_name
+                        target._refresh_initial()
+                        self.contacts.add(target)
+                    else:
+                        target.name = final_name
+                        target._refresh_initial()
+                if final_phone is not None and final_phone != old_phone:
+                    applied = True
+                    if not in_hidden:
+                        try:
+                            if old_phone:
+                                self.suffix_trie.delete(old_phone, cid)
+                        except Exception:
+                            pass
+                        try:
+                            if final_phone:
+                                self.suffix_trie.insert(final_phone, cid)
+                        except Exception:
+                            pass
+                    target.phone_number = final_phone
+                if final_remark is not None:
+                    target.remark = final_remark
+                    applied = True
+                if final_gender is not None:
+                    target.gender = final_gender
+                    applied = True
+                if st["black"] is not None and st["black"] != target.blacklisted:
+                    target.blacklisted = st["black"]
+                    applied = True
             except Exception:
                 continue
 
-        # 重放完成后，保存一次快照并清空 WAL
-        try:
-            self._persist_state()
-        except Exception:
-            pass
+
+        # 仅当重放实际改动了状态时才重写快照；WAL 条目若全部已
+        # 体现在快照中（如上次正常退出），跳过这次全量写盘
+        if applied:
+            # 重放的 add 可能带来比快照更大的 id，补齐 next_id 基准，
+            # 否则恢复后新增联系人会复用已有 id
+            try:
+                max_id = 0
+                for c in list(self.contacts) + self.hidden_contacts:
+                    cid = c.id
+                    if isinstance(cid, int) and cid > max_id:
+                        max_id = cid
+                if max_id >= self.next_id:
+                    self.next_id = max_id + 1
+            except Exception:
+                pass
+            try:
+                self._persist_state()
+            except Exception:
+                pass
 
     # ---------- 黑名单相关方法 ----------
     def set_blacklist(self, name, blacklisted=True):
@@ -625,7 +1124,7 @@ class ContactList:
         if not contact:
             print(f"未找到联系人：{name}")
             return False
-        cid = contact.get("id")
+        cid = contact.id
         entry = {"op": "blacklist", "data": {"id": cid, "blacklisted": bool(blacklisted)}}
         try:
             self._wal_append(entry)
@@ -633,15 +1132,15 @@ class ContactList:
             print("操作失败：无法写入 WAL。")
             return False
 
-        contact["blacklisted"] = bool(blacklisted)
+        contact.blacklisted = bool(blacklisted)
         try:
-            self._persist_state()
+            self._maybe_checkpoint()
         except Exception:
-            print("警告：内存已更新，但持久化失败，WAL 中有未完成事务。")
+            print("警告：内存已更新，但快照写入失败，操作仍保留在 WAL 中。")
             return False
 
-        state = "已加入黑名单" if contact.get("blacklisted") else "已移出黑名单"
-        print(f"联系人 {contact.get('name')} {state}。")
+        state = "已加入黑名单" if contact.blacklisted else "已移出黑名单"
+        print(f"联系人 {contact.name} {state}。")
         return True
 
  # ----------------- Trie 性能基准工具 -----------------
@@ -695,7 +1194,12 @@ def bench_trie(n=20000, q=200, seed=42):
     
 
 
-if __name__=="__main__":
+def main():
+    """交互菜单入口。
+
+    包装成函数后循环里的 cl、choice 等都是 LOAD_FAST 的快速局部变量，
+    不再走模块级全局查找。
+    """
     cl = ContactList()
     while True:
         print("\n通讯录存储与检索系统")
@@ -722,7 +1226,7 @@ if __name__=="__main__":
                 name = input("请输入要查找的联系人姓名：")
                 contact = cl.search_contact(name)
                 if contact:
-                    print(f"找到联系人：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 性别: {contact.get('gender')}, 备注: {contact.get('remark')}")
+                    print(f"找到联系人：名称: {contact.name}, 电话: {contact.phone_number}, 性别: {contact.gender}, 备注: {contact.remark}")
                 else:
                     print("未找到联系人（隐藏联系人不会在正常查询中显示）。")
             elif mode == "2":
@@ -732,7 +1236,7 @@ if __name__=="__main__":
                     print("未找到匹配的联系人。")
                 else:
                     for c in results:
-                        print(f"名称: {c.get('name')}, 电话: {c.get('phone_number')}, 备注: {c.get('remark')}")
+                        print(f"名称: {c.name}, 电话: {c.phone_number}, 备注: {c.remark}")
             elif mode == "3":
                 suffix = input("请输入手机号后缀（例如尾号）：")
                 results = cl.search_by_phone_suffix(suffix)
@@ -740,7 +1244,7 @@ if __name__=="__main__":
                     print("未找到匹配的联系人。")
                 else:
                     for c in results:
-                        print(f"名称: {c.get('name')}, 电话: {c.get('phone_number')}, 备注: {c.get('remark')}")
+                        print(f"名称: {c.name}, 电话: {c.phone_number}, 备注: {c.remark}")
             elif mode == "4":
                 gender_q = input("请输入要查询的性别：").strip()
                 results = cl.search_by_gender(gender_q)
@@ -748,7 +1252,7 @@ if __name__=="__main__":
                     print("未找到匹配的联系人。")
                 else:
                     for c in results:
-                        print(f"名称: {c.get('name')}, 电话: {c.get('phone_number')}, 备注: {c.get('remark')}")
+                        print(f"名称: {c.name}, 电话: {c.phone_number}, 备注: {c.remark}")
             else:
                 print("无效的查找方式。")
         
@@ -762,25 +1266,18 @@ if __name__=="__main__":
             if not contact:
                 print("该联系人不存在")
             else:
-                print(f"当前信息：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 性别: {contact.get('gender')}, 备注: {contact.get('remark')}")
-                new_name = input("请输入新的姓名（回车保留不变）：").strip()
-                new_phone = input("请输入新的电话（回车保留不变）：").strip()
-                new_remark = input("请输入新的备注（回车保留不变）：").strip()
-                new_gender = input("请输入新的性别（回车保留不变）：").strip()
-                if new_name == "":
-                    new_name = None
-                if new_phone == "":
-                    new_phone = None
-                if new_remark == "":
-                    new_remark = None
-                if new_gender == "":
-                    new_gender = None
+                print(f"当前信息：名称: {contact.name}, 电话: {contact.phone_number}, 性别: {contact.gender}, 备注: {contact.remark}")
+                new_name = input("请输入新的姓名（回车保留不变）：").strip() or None
+                new_phone = input("请输入新的电话（回车保留不变）：").strip() or None
+                new_remark = input("请输入新的备注（回车保留不变）：").strip() or None
+                new_gender = input("请输入新的性别（回车保留不变）：").strip() or None
                 cl.edit_contact(name, new_name, new_phone, new_remark, new_gender)
             
         elif choice == "5":
             cl.list_contacts()
         
         elif choice == "6":
+            cl.close()
             print("再见！")
             break
 
@@ -800,3 +1297,7 @@ if __name__=="__main__":
 
         else:
             print("输入错误，请重新输入。")
+
+
+if __name__=="__main__":
+    main()
@@ -1,69 +1,168 @@
+import array
+import bisect
+import functools
 import os
 import json
-import pickle
+import queue
 import tempfile
+import threading
 import time
 import random
 import string
-
-# 前缀索引（按联系人姓名），索引使用联系人id
-class TrieNode:
-    def __init__(self):
-        self.children = {}
-        self.is_end_of_name = False
-        # 存储联系人 id 集合，避免姓名重复导致索引冲突
-        self.contact_ids = set()
-
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# JSON 序列化辅助：优先使用 orjson（C 实现，直接输出 bytes，约 5-6 倍于标准库），
+# 未安装时退回标准库 json
+if orjson is not None:
+    def _dumps(obj):
+        return orjson.dumps(obj)
+
+    def _loads(data):
+        return orjson.loads(data)
+else:
+    def _dumps(obj):
+        # 紧凑分隔符与 orjson 输出保持一致（无多余空格）
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _loads(data):
+        return json.loads(data)
+
+# 前缀索引（按联系人姓名），索引使用联系人id。
+# 节点存放在扁平的并行数组中，以整数下标互联，避免为每个字符分配独立节点对象
+# （姓名含中文等任意 Unicode 字符，子表仍用字典按字符寻址）
 class Trie:
     def __init__(self):
-        self.root = TrieNode()
+        # 下标 0 固定为根节点
+        self.children = [{}]           # 每个节点: {字符: 子节点下标}
+        self.is_end_of_name = [False]
+        # 词尾 id 用有序 array('I') 存放：典型词尾只挂 1 个 id，
+        # 4 字节/元素远小于 set 的哈希表开销，顺序遍历也对缓存更友好
+        self.contact_ids = [array.array("I")]
+        self._free = []                # 可复用的空闲节点下标
+
+    def _new_node(self) -> int:
+        if self._free:
+            idx = self._free.pop()
+            self.children[idx] = {}
+            self.is_end_of_name[idx] = False
+            self.contact_ids[idx] = array.array("I")
+            return idx
+        self.children.append({})
+        self.is_end_of_name.append(False)
+        self.contact_ids.append(array.array("I"))
+        return len(self.children) - 1
 
     def insert(self, name: str, contact_id: int):
         """将联系人姓名插入前缀树，使用 contact_id 作为标识。"""
-        node = self.root
+        # id 只记录在词尾节点：省掉每个祖先节点一次哈希插入，
+        # 内存也随之线性下降；前缀查询改为按需 DFS 汇总（见 search_prefix）。
+        # 热循环内把实例属性绑定为局部变量，省掉每字符的属性查找
+        children = self.children
+        node = 0
         for char in name:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
-            node.contact_ids.add(contact_id)
-        node.is_end_of_name = True
+            nxt = children[node].get(char)
+            if nxt is None:
+                nxt = self._new_node()
+                children[node][char] = nxt
+            node = nxt
+        # 保持有序便于二分查重/删除；重复插入同一 (姓名, id) 不产生重复项
+        ids = self.contact_ids[node]
+        pos = bisect.bisect_left(ids, contact_id)
+        if pos == len(ids) or ids[pos] != contact_id:
+            ids.insert(pos, contact_id)
+        self.is_end_of_name[node] = True
 
     def search_prefix(self, prefix: str) -> set:
-        """返回与前缀匹配的联系人 id 集合（可能为空）。"""
-        node = self.root
+        """返回与前缀匹配的联系人 id 集合（可能为空）。
+
+        id 只存在词尾节点上，这里沿前缀定位后对子树做迭代 DFS 汇总；
+        典型前缀的子树很小，远比维护全路径并集便宜。
+        """
+        if not prefix:
+            return set()
+        children = self.children
+        node = 0
         for char in prefix:
-            if char not in node.children:
+            nxt = children[node].get(char)
+            if nxt is None:
                 return set()
-            node = node.children[char]
-        return set(node.contact_ids)
+            node = nxt
+        contact_ids = self.contact_ids
+        result = set()
+        stack = [node]
+        while stack:
+            cur = stack.pop()
+            if contact_ids[cur]:
+                result.update(contact_ids[cur])
+            stack.extend(children[cur].values())
+        return result
 
     def delete(self, name: str, contact_id: int):
         """从前缀树中删除联系人 id 的索引引用。"""
-        def _delete(node: TrieNode, name: str, depth: int) -> bool:
-            if depth == len(name):
-                if node.is_end_of_name:
-                    node.is_end_of_name = False
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_name
-            char = name[depth]
-            if char in node.children:
-                should_delete_child = _delete(node.children[char], name, depth + 1)
-                if should_delete_child:
-                    del node.children[char]
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_name
-            return False
-
-        _delete(self.root, name, 0)
-
-# 后缀索引（按联系人电话）
+        # 自上而下记录路径；命中词尾后清除 id，再回溯摘除空节点
+        # （空槽位进入空闲表复用）。中间节点不再持有 id，无需沿途清理
+        children = self.children
+        path = []
+        node = 0
+        for char in name:
+            nxt = children[node].get(char)
+            if nxt is None:
+                return
+            path.append((node, char, nxt))
+            node = nxt
+        self.is_end_of_name[node] = False
+        ids = self.contact_ids[node]
+        pos = bisect.bisect_left(ids, contact_id)
+        if pos < len(ids) and ids[pos] == contact_id:
+            del ids[pos]
+        for parent, char, child in reversed(path):
+            if not children[child] and not self.is_end_of_name[child] and not self.contact_ids[child]:
+                del children[parent][char]
+                self._free.append(child)
+
+# 后缀索引（按联系人电话）。电话字符集基本是数字 0-9，
+# 子表用固定 10 槽数组按位取下标，省掉每字符一次哈希查找；
+# 罕见的非数字字符（如 +、-）退回到按字符的字典
 class SuffixTrieNode:
+    # 去掉每实例 __dict__（约省一半内存），属性访问也更快；
+    # 节点数以万计时能明显改善缓存驻留
+    __slots__ = ("children", "extra", "n_children", "is_end_of_phone", "contact_ids")
+
     def __init__(self):
-        self.children = {}
+        self.children = [None] * 10   # 数字子节点，按 ord(ch)-48 寻址
+        self.extra = None             # 非数字字符的字典子表（按需创建）
+        self.n_children = 0           # 在用子节点计数，省去空槽扫描
         self.is_end_of_phone = False
         # 存储联系人 id 集合，避免不同联系人同名或同号冲突
         self.contact_ids = set()
 
+    def get_child(self, char):
+        if "0" <= char <= "9":
+            return self.children[ord(char) - 48]
+        return self.extra.get(char) if self.extra else None
+
+    def del_child(self, char):
+        if "0" <= char <= "9":
+            self.children[ord(char) - 48] = None
+        elif self.extra:
+            self.extra.pop(char, None)
+        self.n_children -= 1
+
 
 class SuffixTrie:
     def __init__(self):
@@ -73,79 +172,151 @@ class SuffixTrie:
         """将联系人电话插入后缀树，使用 contact_id 作为标识。"""
         node = self.root
         for char in reversed(phone):
-            if char not in node.children:
-                node.children[char] = SuffixTrieNode()
-            node = node.children[char]
+            if "0" <= char <= "9":
+                i = ord(char) - 48
+                nxt = node.children[i]
+                if nxt is None:
+                    nxt = SuffixTrieNode()
+                    node.children[i] = nxt
+                    node.n_children += 1
+            else:
+                if node.extra is None:
+                    node.extra = {}
+                nxt = node.extra.get(char)
+                if nxt is None:
+                    nxt = SuffixTrieNode()
+                    node.extra[char] = nxt
+                    node.n_children += 1
+            node = nxt
             node.contact_ids.add(contact_id)
         node.is_end_of_phone = True
 
     def search_suffix(self, suffix: str) -> set:
-        """返回与后缀匹配的联系人 id 集合（可能为空）。"""
+        """返回与后缀匹配的联系人 id 集合（可能为空）。
+
+        与 Trie.search_prefix 相同的只读约定：直接返回节点集合，不做拷贝。
+        """
         node = self.root
         for char in reversed(suffix):
-            if char not in node.children:
+            node = node.get_child(char)
+            if node is None:
                 return set()
-            node = node.children[char]
-        return set(node.contact_ids)
+        return node.contact_ids
 
     def delete(self, phone: str, contact_id: int):
         """从后缀树中删除联系人 id 的索引引用。"""
-        def _delete(node: SuffixTrieNode, phone: str, depth: int) -> bool:
-            if depth == len(phone):
-                if node.is_end_of_phone:
-                    node.is_end_of_phone = False
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_phone
-            char = phone[len(phone) - 1 - depth]
-            if char in node.children:
-                should_delete_child = _delete(node.children[char], phone, depth + 1)
-                if should_delete_child:
-                    del node.children[char]
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_phone
-            return False
+        # 与前缀树相同的迭代两段式：先按后缀顺序记录路径，再回溯摘除空节点
+        path = []
+        node = self.root
+        complete = True
+        for char in reversed(phone):
+            nxt = node.get_child(char)
+            if nxt is None:
+                complete = False
+                break
+            path.append((node, char, nxt))
+            node = nxt
+        if complete:
+            node.is_end_of_phone = False
+        elif path:
+            # 匹配中断的节点本身不清除（递归版在此直接返回）
+            path.pop()
+        for parent, char, child in reversed(path):
+            child.contact_ids.discard(contact_id)
+            if complete and child.n_children == 0 and not child.is_end_of_phone:
+                parent.del_child(char)
+
+def _name_sort_key(name):
+    """姓名的排序键：英文字母首字符不区分大小写，空名排最后。"""
+    if not name:
+        return ("~", "")
+    return (name[0].upper(), name)
 
-        _delete(self.root, phone, 0)
 
 class ContactList:
     def __init__(self):
-        self.contacts = []
+        # 以 id 为键的联系人字典（保持插入有序），id 定位为 O(1)
+        self.contacts = {}
         # 前缀索引（按姓名），与 contacts 中的 name 字段保持一致
         self.trie = Trie()
         # 后缀索引（按电话）
         self.suffix_trie = SuffixTrie()
+        # 精确匹配快路径：电话 -> id（电话唯一）、姓名 -> id 集合
+        self.phone_index = {}
+        self.name_index = {}
+        # id -> 联系人 JSON 字节缓存：快照只重新序列化改动过的条目
+        self._contact_json = {}
+        # id -> 预计算排序键：排序时键提取走 C 层的 dict 取值，
+        # 不再对每个联系人调用 Python 比较键函数
+        self._sort_keys = {}
+        # 查询记忆化：缓存键带代数计数器，任何增删改把代数 +1，
+        # 旧代条目不再被引用、由 LRU 自然逐出；交互中逐键重复的
+        # 同一前缀/后缀查询直接命中，不再每次下钻 trie
+        self._index_gen = 0
+        self._prefix_ids = functools.lru_cache(maxsize=256)(self._prefix_lookup)
+        self._suffix_ids = functools.lru_cache(maxsize=256)(self._suffix_lookup)
         # 下一个分配的联系人唯一 id
         self.next_id = 1
         # 数据文件路径
         self.data_dir = os.path.join(os.getcwd(), "data")
         self.contacts_path = os.path.join(self.data_dir, "contacts.json")
-        self.trie_path = os.path.join(self.data_dir, "trie.pkl")
         self.wal_path = os.path.join(self.data_dir, "contacts.wal")
 
         # 初始化持久化目录并加载状态（包含重放 WAL）
         self._ensure_data_dir()
+        # WAL 常驻句柄与后台写线程：fsync 移出调用方热路径，
+        # 排队的多条操作由写线程聚合为一次写入+fsync
+        self._wal_fp = open(self.wal_path, "ab")
+        # WAL 记录格式（二进制 msgpack / 文本 JSONL），首次追加时按
+        # 存量文件首字节探测
+        self._wal_use_binary = None
+        self._wal_queue = queue.Queue()
+        self._wal_writer = threading.Thread(target=self._wal_writer_loop, daemon=True)
+        self._wal_writer.start()
+        # 快照检查点阈值：累计该数量的操作后才重写全量快照，摊薄 O(N) 快照成本
+        self._ops_since_snapshot = 0
+        self._snapshot_threshold = 1000
         self._load_state()
         self._replay_wal()
+        # 启动后一次性建立精确索引，此后由增删改路径增量维护。
+        # 姓名与电话顺带 intern：快照/WAL 里反复出现的串全库只留
+        # 一份，等值比较和索引探测先命中指针相等的快路径
+        for cid, c in self.contacts.items():
+            name = c.get("name") or ""
+            if name:
+                name = sys.intern(str(name))
+                c["name"] = name
+            phone = c.get("phone_number")
+            if phone:
+                phone = sys.intern(str(phone))
+                c["phone_number"] = phone
+                self.phone_index[phone] = cid
+            self.name_index.setdefault(name, set()).add(cid)
+            self._sort_keys[cid] = _name_sort_key(name)
 
 #添加联系人
-    def add_contact(self, name, phone_number, remark=""):
-        # 检查完全重复（姓名+电话）
-        for c in self.contacts:
-            if c.get("name") == name and c.get("phone_number") == phone_number:
-                print("添加失败：已存在相同姓名和电话的联系人（重复条目）。")
-                return False
+    def add_contact(self, name, phone_number, remark="", sync=True):
+        # 姓名与电话先 intern：重复串不另存副本，下面的查重比较
+        # 与索引探测都从指针相等的快路径开始
+        name = sys.intern(str(name))
+        phone_number = sys.intern(str(phone_number))
+        # 三项查重（完全重复/同名/同号）全部走哈希索引，
+        # 每项都是 O(1) 探测，批量导入不再是 O(N^2)
+        owner_id = self.phone_index.get(phone_number)
+        phone_owner = self.contacts.get(owner_id) if owner_id is not None else None
+        if phone_owner is not None and phone_owner.get("name") == name:
+            print("添加失败：已存在相同姓名和电话的联系人（重复条目）。")
+            return False
 
         # 如果已有同名联系人，强制要求提供备注以区分
-        if any(c.get("name") == name for c in self.contacts):
-            if not remark or str(remark).strip() == "":
-                print("添加失败：已存在同名联系人，必须填写备注以区分。")
-                return False
+        if self.name_index.get(name) and (not remark or str(remark).strip() == ""):
+            print("添加失败：已存在同名联系人，必须填写备注以区分。")
+            return False
 
-        # 检查手机号唯一性（不同联系人不能共用同一手机号）
-        for c in self.contacts:
-            if c.get("phone_number") == phone_number:
-                print(f"添加失败：手机号 {phone_number} 已被联系人 {c.get('name')} 使用。")
-                return False
+        # 手机号唯一性（不同联系人不能共用同一手机号）
+        if phone_owner is not None:
+            print(f"添加失败：手机号 {phone_number} 已被联系人 {phone_owner.get('name')} 使用。")
+            return False
 
         # 分配唯一 id
         contact_id = self.next_id
@@ -154,14 +325,14 @@ class ContactList:
         # 记录 WAL（包含 id）并执行添加，然后持久化快照（原子替换）
         entry = {"op": "add", "data": {"id": contact_id, "name": name, "phone_number": phone_number, "remark": remark}}
         try:
-            self._wal_append(entry)
+            self._wal_append(entry, sync=sync)
         except Exception:
             print("添加失败：无法写入 WAL。")
             return False
 
         # 执行内存添加（不再检查 WAL）
         contact = {"id": contact_id, "name": name, "phone_number": phone_number, "remark": remark}
-        self.contacts.append(contact)
+        self.contacts[contact_id] = contact
         try:
             self.trie.insert(name, contact_id)
         except Exception:
@@ -170,12 +341,16 @@ class ContactList:
             self.suffix_trie.insert(phone_number, contact_id)
         except Exception:
             pass
+        self.phone_index[phone_number] = contact_id
+        self.name_index.setdefault(name, set()).add(contact_id)
+        self._sort_keys[contact_id] = _name_sort_key(name)
+        self._index_gen += 1
 
-        # 持久化快照并清空 WAL
+        # 超过阈值时写快照检查点（持久性已由 WAL 保证）
         try:
-            self._persist_state()
+            self._maybe_checkpoint()
         except Exception:
-            print("添加警告：已在内存中添加联系人，但持久化失败，WAL 中有未完成事务。")
+            print("添加警告：已在内存中添加联系人，但快照写入失败，操作仍保留在 WAL 中。")
             return False
 
         print(f"联系人 {name} 添加成功！")
@@ -183,13 +358,14 @@ class ContactList:
 
     def search_contact(self, name):
         """按精确姓名查找联系人，返回第一个匹配的联系人字典或 None。"""
-        for c in self.contacts:
-            if c.get("name") == name:
-                return c
-        return None
+        ids = self.name_index.get(name)
+        if not ids:
+            return None
+        # 取 id 最小者，与原先按插入序扫描返回首个匹配一致
+        return self.contacts.get(min(ids))
 
 #删除联系人
-    def delete_contact(self, name):
+    def delete_contact(self, name, sync=True):
         contact = self.search_contact(name)
         if not contact:
             print(f"不存在 {name}，删除失败")
@@ -199,17 +375,15 @@ class ContactList:
         contact_id = contact.get("id")
         entry = {"op": "delete", "data": {"id": contact_id, "name": name}}
         try:
-            self._wal_append(entry)
+            self._wal_append(entry, sync=sync)
         except Exception:
             print("删除失败：无法写入 WAL。")
             return False
 
-        # 执行内存删除
+        # 执行内存删除（按 id 直接定位，O(1)）
         old_phone = contact.get("phone_number")
-        try:
-            self.contacts.remove(contact)
-        except Exception:
-            pass
+        self.contacts.pop(contact_id, None)
+        self._contact_json.pop(contact_id, None)
         try:
             self.trie.delete(name, contact_id)
         except Exception:
@@ -219,19 +393,28 @@ class ContactList:
                 self.suffix_trie.delete(old_phone, contact_id)
         except Exception:
             pass
-
-        # 持久化快照并清空 WAL
+        if old_phone and self.phone_index.get(old_phone) == contact_id:
+            del self.phone_index[old_phone]
+        name_ids = self.name_index.get(name)
+        if name_ids is not None:
+            name_ids.discard(contact_id)
+            if not name_ids:
+                del self.name_index[name]
+        self._sort_keys.pop(contact_id, None)
+        self._index_gen += 1
+
+        # 超过阈值时写快照检查点（持久性已由 WAL 保证）
         try:
-            self._persist_state()
+            self._maybe_checkpoint()
         except Exception:
-            print("删除警告：内存已删除，但持久化失败，WAL 中有未完成事务。")
+            print("删除警告：内存已删除，但快照写入失败，操作仍保留在 WAL 中。")
             return False
 
         print(f"联系人 {name} 删除成功！")
         return True
 
 #修改联系人信息
-    def edit_contact(self, name, new_name=None, new_phone=None, new_remark=None):
+    def edit_contact(self, name, new_name=None, new_phone=None, new_remark=None, sync=True):
         contact = self.search_contact(name)
         if not contact:
             print(f"未找到联系人：{name}")
@@ -240,7 +423,7 @@ class ContactList:
         contact_id = contact.get("id")
         entry = {"op": "edit", "data": {"id": contact_id, "name": name, "new_name": new_name, "new_phone": new_phone, "new_remark": new_remark}}
         try:
-            self._wal_append(entry)
+            self._wal_append(entry, sync=sync)
         except Exception:
             print("修改失败：无法写入 WAL。")
             return False
@@ -250,22 +433,26 @@ class ContactList:
         old_phone = contact.get("phone_number")
 
         # 计算最终要设置的值
-        final_name = old_name if new_name is None else new_name
-        final_phone = old_phone if new_phone is None else new_phone
+        # 新值同样 intern（旧值在添加/启动时已处理过）
+        final_name = old_name if new_name is None else sys.intern(str(new_name))
+        final_phone = old_phone if new_phone is None else sys.intern(str(new_phone))
 
-        # 如果将姓名修改为已存在的姓名，强制要求填写备注（new_remark 必须非空）
+        # 目标姓名重复与手机号唯一性同样走哈希索引（失败优先级保持：
+        # 先报姓名重复，再报手机号冲突）
         if new_name is not None and new_name != old_name:
-            if any(c.get("name") == new_name and c.get("id") != contact_id for c in self.contacts):
+            name_ids = self.name_index.get(new_name)
+            # 如果将姓名修改为已存在的姓名，强制要求填写备注（new_remark 必须非空）
+            if name_ids and any(i != contact_id for i in name_ids):
                 if not new_remark or str(new_remark).strip() == "":
                     print("修改失败：目标姓名与已有联系人重复，必须填写备注以区分。")
                     return False
-
-        # 如果要修改手机号，先检查唯一性
         if new_phone is not None and new_phone != old_phone:
-            for c in self.contacts:
-                if c.get("id") != contact_id and c.get("phone_number") == new_phone:
-                    print(f"修改失败：手机号 {new_phone} 已被联系人 {c.get('name')} 使用。")
-                    return False
+            owner_id = self.phone_index.get(new_phone)
+            if owner_id is not None and owner_id != contact_id:
+                phone_owner = self.contacts.get(owner_id)
+                owner_name = phone_owner.get("name") if phone_owner else ""
+                print(f"修改失败：手机号 {new_phone} 已被联系人 {owner_name} 使用。")
+                return False
 
         # 应用索引变更（使用 id）
         try:
@@ -291,61 +478,87 @@ class ContactList:
         except Exception:
             pass
 
-        # 更新联系人内容
+        # 同步精确索引
+        if new_name is not None and new_name != old_name:
+            name_ids = self.name_index.get(old_name)
+            if name_ids is not None:
+                name_ids.discard(contact_id)
+                if not name_ids:
+                    del self.name_index[old_name]
+            self.name_index.setdefault(final_name, set()).add(contact_id)
+        if new_phone is not None and new_phone != old_phone:
+            if old_phone and self.phone_index.get(old_phone) == contact_id:
+                del self.phone_index[old_phone]
+            self.phone_index[final_phone] = contact_id
+
+        # 更新联系人内容（使缓存的 JSON 字节与排序键失效）
         contact["name"] = final_name
         contact["phone_number"] = final_phone
+        self._sort_keys[contact_id] = _name_sort_key(final_name)
+        self._index_gen += 1
         if new_remark is not None:
             contact["remark"] = new_remark
+        self._contact_json.pop(contact_id, None)
 
-        # 持久化快照并清空 WAL
+        # 超过阈值时写快照检查点（持久性已由 WAL 保证）
         try:
-            self._persist_state()
+            self._maybe_checkpoint()
         except Exception:
-            print("修改警告：内存已修改，但持久化失败，WAL 中有未完成事务。")
+            print("修改警告：内存已修改，但快照写入失败，操作仍保留在 WAL 中。")
             return False
 
         print(f"联系人 {name} 已更新。")
         return True
 
     def search_by_prefix(self, prefix):
-        """使用前缀索引返回匹配的联系人列表。"""
-        ids = self.trie.search_prefix(prefix)
+        """使用前缀索引返回匹配的联系人列表。
+
+        contacts 本身就是 id -> 联系人字典，命中 id 直查即可，
+        总代价 O(|命中|)，与通讯录规模无关；id 集合经 LRU 记忆化。
+        """
+        ids = self._prefix_ids(self._index_gen, prefix)
         if not ids:
             return []
-        results = [c for c in self.contacts if c.get("id") in ids]
-        return results
+        contacts = self.contacts
+        return [contacts[i] for i in ids if i in contacts]
+
+    def _prefix_lookup(self, gen, prefix):
+        """供记忆化缓存调用；gen 只参与缓存键。返回有序 id 元组。"""
+        return tuple(sorted(self.trie.search_prefix(prefix)))
 
     def search_by_phone_suffix(self, suffix):
         """使用后缀索引返回匹配的联系人列表（按电话后缀）。"""
-        ids = self.suffix_trie.search_suffix(suffix)
+        # 全长号码直接查电话反向索引，命中即 O(1) 返回；未命中再走后缀树
+        if len(suffix) >= 11:
+            cid = self.phone_index.get(suffix)
+            if cid is not None and cid in self.contacts:
+                return [self.contacts[cid]]
+        ids = self._suffix_ids(self._index_gen, suffix)
         if not ids:
             return []
-        results = [c for c in self.contacts if c.get("id") in ids]
-        return results
+        contacts = self.contacts
+        return [contacts[i] for i in ids if i in contacts]
+
+    def _suffix_lookup(self, gen, suffix):
+        """供记忆化缓存调用；gen 只参与缓存键。返回有序 id 元组。"""
+        return tuple(sorted(self.suffix_trie.search_suffix(suffix)))
 
 #列出所有联系人
     def list_contacts(self):
         if not self.contacts:
             print("联系人列表为空。")
             return
-        for i, c in enumerate(self.contacts, start=1):
+        for i, c in enumerate(self.contacts.values(), start=1):
             print(f"{i}. 名称: {c.get('name')}, 电话: {c.get('phone_number')}, 备注: {c.get('remark')}")
 
     def sort_contacts_by_initial(self):
         """按姓名首字母（首字符）排序联系人列表，修改原列表顺序。"""
-        def sort_key(c):
-            name = c.get("name") or ""
-            if name == "":
-                return ("~", "")
-            first = name[0]
-            try:
-                # 英文字母按不区分大小写排序；其他字符按原顺序（Unicode）
-                first_key = first.upper()
-            except Exception:
-                first_key = first
-            return (first_key, name)
-
-        self.contacts.sort(key=sort_key)
+        # 排序键在增删改时已预计算好，这里只按 id 排序再重建字典
+        # （保持插入顺序）；键提取是 dict.__getitem__，全程无 Python
+        # 回调，也不在内循环里做 upper 与元组分配
+        contacts = self.contacts
+        self.contacts = {cid: contacts[cid]
+                         for cid in sorted(contacts, key=self._sort_keys.__getitem__)}
         print("联系人已按姓名首字母排序。")
 
     # ---------- 持久化相关方法（WAL + 原子快照） ----------
@@ -356,35 +569,87 @@ class ContactList:
             except Exception:
                 pass
 
-    def _wal_append(self, entry: dict):
-        """将操作追加到 WAL 并确保写入磁盘。"""
-        with open(self.wal_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-            f.flush()
-            os.fsync(f.fileno())
+    def _wal_encode(self, entry: dict) -> bytes:
+        """把一条 WAL 记录编码成待写字节。
 
-    def _atomic_write_json(self, path, obj):
-        dirpath = os.path.dirname(path)
-        fd, tmp = tempfile.mkstemp(dir=dirpath)
-        try:
-            with os.fdopen(fd, "w", encoding="utf-8") as tf:
-                json.dump(obj, tf, ensure_ascii=False, indent=2)
-                tf.flush()
-                os.fsync(tf.fileno())
-            os.replace(tmp, path)
-        finally:
-            if os.path.exists(tmp):
+        装有 msgpack 时用二进制记录：u32 小端长度前缀 + packb 负载，
+        序列化快、体积小，重放按长度精确切分；存量 JSONL 文件（首
+        字节 '{'）继续按行追加，等下次快照截断后自动切到二进制。
+        """
+        if self._wal_use_binary is None:
+            use = msgpack is not None
+            if use:
                 try:
-                    os.remove(tmp)
-                except Exception:
+                    with open(self.wal_path, "rb") as f:
+                        if f.read(1) == b"{":
+                            use = False
+                except OSError:
                     pass
+            self._wal_use_binary = use
+        if self._wal_use_binary:
+            blob = msgpack.packb(entry)
+            return len(blob).to_bytes(4, "little") + blob
+        return _dumps(entry) + b"\n"
+
+    def _wal_append(self, entry: dict, sync=True):
+        """把操作交给后台写线程；sync=True 时阻塞等待该条目落盘。"""
+        if sync:
+            done = threading.Event()
+            self._wal_queue.put((self._wal_encode(entry), done))
+            done.wait()
+        else:
+            self._wal_queue.put((self._wal_encode(entry), None))
+
+    def _wal_writer_loop(self):
+        """后台 WAL 写线程：批量取出排队条目，一次写入+一次 fsync（组提交）。"""
+        while True:
+            item = self._wal_queue.get()
+            batch = [item]
+            # 把此刻已排队的其余条目一并带上，摊薄 fsync 成本
+            while True:
+                try:
+                    batch.append(self._wal_queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            bufs = []
+            events = []
+            for it in batch:
+                if it is None:
+                    stop = True
+                    continue
+                payload, ev = it
+                if payload:
+                    bufs.append(payload)
+                if ev is not None:
+                    events.append(ev)
+            try:
+                if bufs:
+                    self._wal_fp.write(b"".join(bufs))
+                    self._wal_fp.flush()
+                    os.fsync(self._wal_fp.fileno())
+            except Exception:
+                pass
+            for ev in events:
+                ev.set()
+            if stop:
+                return
 
-    def _atomic_write_pickle(self, path, obj):
+    def flush_wal(self):
+        """等待后台线程把当前已排队的全部 WAL 条目落盘。"""
+        done = threading.Event()
+        self._wal_queue.put((b"", done))
+        done.wait()
+
+    def _atomic_write_json(self, path, obj):
+        self._atomic_write_bytes(path, _dumps(obj))
+
+    def _atomic_write_bytes(self, path, data: bytes):
         dirpath = os.path.dirname(path)
         fd, tmp = tempfile.mkstemp(dir=dirpath)
         try:
             with os.fdopen(fd, "wb") as tf:
-                pickle.dump(obj, tf)
+                tf.write(data)
                 tf.flush()
                 os.fsync(tf.fileno())
             os.replace(tmp, path)
@@ -395,44 +660,81 @@ class ContactList:
                 except Exception:
                     pass
 
-    def _persist_state(self):
-        """写入 contacts.json 和 trie.pkl 的原子快照，并在成功后清空 WAL。"""
-        # 写 contacts
-        try:
-            self._atomic_write_json(self.contacts_path, {"contacts": self.contacts})
-        except Exception as e:
-            raise
+    def _maybe_checkpoint(self):
+        """累计操作计数，达到阈值后才重写全量快照并清空 WAL。"""
+        self._ops_since_snapshot += 1
+        if self._ops_since_snapshot >= self._snapshot_threshold:
+            self._persist_state()
+            self._ops_since_snapshot = 0
 
-        # 写 trie（pickle 序列化内存结构）
+    def close(self):
+        """刷新 WAL 队列、写最终快照，并停掉写线程、关闭 WAL 句柄。"""
         try:
-            self._atomic_write_pickle(self.trie_path, {"trie": self.trie, "suffix_trie": self.suffix_trie})
+            self.flush_wal()
+            self._persist_state()
         except Exception:
+            pass
+        try:
+            self._wal_queue.put(None)
+            self._wal_writer.join(timeout=5)
+        except Exception:
+            pass
+        try:
+            self._wal_fp.close()
+        except Exception:
+            pass
+
+    def _persist_state(self):
+        """写入 contacts.json 的原子快照，并在成功后清空 WAL。
+
+        trie 不再落盘：两棵树完全由联系人列表推导，启动时顺序重插
+        一遍比逐节点 pickle/反 pickle 一大片小对象省时省内存，快照
+        也不会再和联系人数据出现版本错位。
+        """
+        # 先确保缓冲中的 WAL 条目已落盘，保证快照覆盖全部已记录操作
+        self.flush_wal()
+
+        # 写 contacts（快照格式仍为列表，与旧文件兼容）。
+        # 逐条缓存序列化结果，只有改动过的联系人才重新 dump，其余直接拼接字节
+        try:
+            cache = self._contact_json
+            parts = []
+            for cid, c in self.contacts.items():
+                line = cache.get(cid)
+                if line is None:
+                    line = _dumps(c)
+                    cache[cid] = line
+                parts.append(line)
+            self._atomic_write_bytes(self.contacts_path, b'{"contacts":[' + b",".join(parts) + b"]}")
+        except Exception as e:
             raise
 
-        # 成功后清空 WAL（truncate）
+        # 成功后清空 WAL：直接在常驻句柄上原地截断，
+        # 免去重新 open/close 一对系统调用（append 模式写入总在文件尾，截断安全）。
+        # 文件清空后下次追加重新探测格式（旧 JSONL 由此切换到二进制）
+        self._wal_use_binary = None
         try:
-            with open(self.wal_path, "w", encoding="utf-8") as f:
-                f.truncate(0)
-                f.flush()
-                os.fsync(f.fileno())
+            self._wal_fp.seek(0)
+            self._wal_fp.truncate()
+            os.fsync(self._wal_fp.fileno())
         except Exception:
             pass
 
     def _load_state(self):
-        """加载 contacts.json 与 trie.pkl（若存在）。"""
+        """加载 contacts.json（若存在），并从联系人重建索引。"""
         # load contacts
         try:
             if os.path.exists(self.contacts_path):
-                with open(self.contacts_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.contacts = data.get("contacts", [])
+                with open(self.contacts_path, "rb") as f:
+                    data = _loads(f.read())
+                    self.contacts = {c.get("id"): c for c in data.get("contacts", [])}
         except Exception:
-            self.contacts = []
+            self.contacts = {}
 
         # 更新 next_id 基准（确保 id 不会重复）
         try:
             max_id = 0
-            for c in self.contacts:
+            for c in self.contacts.values():
                 cid = c.get("id")
                 if isinstance(cid, int) and cid > max_id:
                     max_id = cid
@@ -441,42 +743,74 @@ class ContactList:
         except Exception:
             pass
 
-        # load trie snapshot if exists
-        try:
-            if os.path.exists(self.trie_path):
-                with open(self.trie_path, "rb") as f:
-                    obj = pickle.load(f)
-                    self.trie = obj.get("trie", self.trie)
-                    self.suffix_trie = obj.get("suffix_trie", self.suffix_trie)
-        except Exception:
-            pass
+        # trie 从联系人确定性重建，不再读取 trie.pkl
+        if self.contacts:
+            self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """根据当前联系人重建前缀/后缀索引。"""
+        self.trie = Trie()
+        self.suffix_trie = SuffixTrie()
+        for c in self.contacts.values():
+            try:
+                self.trie.insert(c.get("name") or "", c.get("id"))
+            except Exception:
+                pass
+            try:
+                if c.get("phone_number"):
+                    self.suffix_trie.insert(c.get("phone_number"), c.get("id"))
+            except Exception:
+                pass
 
     def _replay_wal(self):
         """读取并重放 WAL 中的操作（若存在），以恢复未完成事务。"""
         if not os.path.exists(self.wal_path):
             return
         try:
-            with open(self.wal_path, "r", encoding="utf-8") as f:
-                lines = [l.strip() for l in f if l.strip()]
+            with open(self.wal_path, "rb") as f:
+                blob = f.read()
         except Exception:
             return
 
-        if not lines:
+        if not blob:
             return
 
-        # 重放每一条操作
-        for ln in lines:
-            try:
-                entry = json.loads(ln)
-            except Exception:
-                continue
+        # 按首字节识别格式：'{' 为逐行 JSON，否则为长度前缀 msgpack
+        # （崩溃留下的截尾半条记录按长度检查丢弃）
+        records = []
+        if blob[:1] == b"{":
+            for ln in blob.split(b"\n"):
+                ln = ln.strip()
+                if not ln:
+                    continue
+                try:
+                    records.append(_loads(ln))
+                except Exception:
+                    continue
+        elif msgpack is not None:
+            pos = 0
+            n = len(blob)
+            while pos + 4 <= n:
+                length = int.from_bytes(blob[pos:pos + 4], "little")
+                pos += 4
+                if pos + length > n:
+                    break
+                try:
+                    records.append(msgpack.unpackb(blob[pos:pos + length]))
+                except Exception:
+                    pass
+                pos += length
+
+        # 重放每一条操作；只有确实改动了内存状态时才值得重写快照
+        applied = False
+        for entry in records:
             op = entry.get("op")
             data = entry.get("data", {})
             try:
                 if op == "add":
                     # 使用 WAL 中的 id（若存在），避免重复添加
                     wid = data.get("id")
-                    exists = any(c.get("id") == wid for c in self.contacts if wid is not None)
+                    exists = wid is not None and wid in self.contacts
                     if not exists:
                         # 如果没有 id，则分配新 id
                         if wid is None:
@@ -487,7 +821,8 @@ class ContactList:
                             if wid >= self.next_id:
                                 self.next_id = wid + 1
                         contact = {"id": wid, "name": data.get("name"), "phone_number": data.get("phone_number"), "remark": data.get("remark")}
-                        self.contacts.append(contact)
+                        self.contacts[wid] = contact
+                        applied = True
                         try:
                             self.trie.insert(contact.get("name"), contact.get("id"))
                         except Exception:
@@ -500,16 +835,14 @@ class ContactList:
                     cid = data.get("id")
                     contact = None
                     if cid is not None:
-                        contact = next((c for c in self.contacts if c.get("id") == cid), None)
+                        contact = self.contacts.get(cid)
                     else:
                         # fallback by name
                         name = data.get("name")
-                        contact = next((c for c in self.contacts if c.get("name") == name), None)
+                        contact = next((c for c in self.contacts.values() if c.get("name") == name), None)
                     if contact:
-                        try:
-                            self.contacts.remove(contact)
-                        except Exception:
-                            pass
+                        applied = True
+                        self.contacts.pop(contact.get("id"), None)
                         try:
                             self.trie.delete(contact.get("name"), contact.get("id"))
                         except Exception:
@@ -524,11 +857,12 @@ class ContactList:
                     cid = data.get("id")
                     contact = None
                     if cid is not None:
-                        contact = next((c for c in self.contacts if c.get("id") == cid), None)
+                        contact = self.contacts.get(cid)
                     else:
                         name = data.get("name")
-                        contact = next((c for c in self.contacts if c.get("name") == name), None)
+                        contact = next((c for c in self.contacts.values() if c.get("name") == name), None)
                     if contact:
+                        applied = True
                         new_name = data.get("new_name")
                         new_phone = data.get("new_phone")
                         new_remark = data.get("new_remark")
@@ -560,110 +894,24 @@ class ContactList:
             except Exception:
                 continue
 
-        # 重放完成后，保存一次快照并清空 WAL
-        try:
-            self._persist_state()
-        except Exception:
-            pass
-
-if __name__=="__main__":
-    cl = ContactList()
-    while True:
-        print("\n通讯录存储与检索系统")
-        print("1. 添加联系人")
-        print("2. 查找联系人")
-        print("3. 删除联系人")
-        print("4. 修改联系人信息")
-        print("5. 列出所有联系人")
-        print("6. 退出系统")
-        print("7. Trie 性能基准测试")
-        choice = input("请选择操作选项：")
-
-        if choice == "1":
-            name = input("请输入联系人姓名：")
-            phone_number = input("请输入联系人电话：")
-            remark = input("请输入备注（可选,不输入默认空白）：")
-            cl.add_contact(name,phone_number,remark)
-        
-        elif choice == "2":
-            print("查找方式：1. 按全名  2. 按姓名前缀  3. 按手机号后缀")
-            mode = input("请选择查找方式(1/2/3)：").strip()
-            if mode == "1":
-                name = input("请输入要查找的联系人姓名：")
-                contact = cl.search_contact(name)
-                if contact:
-                    print(f"找到联系人：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 备注: {contact.get('remark')}")
-                else:
-                    print("该联系人不存在")
-            elif mode == "2":
-                prefix = input("请输入姓名前缀：")
-                results = cl.search_by_prefix(prefix)
-                if not results:
-                    print("未找到匹配的联系人。")
-                else:
-                    for i, c in enumerate(results, start=1):
-                        print(f"{i}. 名称: {c.get('name')}, 电话: {c.get('phone_number')}, 备注: {c.get('remark')}")
-            elif mode == "3":
-                suffix = input("请输入手机号后缀（例如尾号）：")
-                results = cl.search_by_phone_suffix(suffix)
-                if not results:
-                    print("未找到匹配的联系人。")
-                else:
-                    for i, c in enumerate(results, start=1):
-                        print(f"{i}. 名称: {c.get('name')}, 电话: {c.get('phone_number')}, 备注: {c.get('remark')}")
-            else:
-                print("无效的查找方式。")
-        
-        elif choice == "3":
-            name = input("请输入联系人姓名：")
-            cl.delete_contact(name)
-
-        elif choice == "4":
-            name = input("请输入联系人姓名：")
-            contact = cl.search_contact(name)
-            if not contact:
-                print("该联系人不存在")
-            else:
-                print(f"当前信息：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 备注: {contact.get('remark')}")
-                new_name = input("请输入新的姓名（回车保留不变）：").strip()
-                new_phone = input("请输入新的电话（回车保留不变）：").strip()
-                new_remark = input("请输入新的备注（回车保留不变）：").strip()
-                if new_name == "":
-                    new_name = None
-                if new_phone == "":
-                    new_phone = None
-                if new_remark == "":
-                    new_remark = None
-                cl.edit_contact(name, new_name, new_phone, new_remark)
-            
-        elif choice == "5":
-            cl.list_contacts()
-        elif choice == "7":
+        # 仅当重放实际改动了状态时才重写快照；上次正常退出留下的
+        # WAL 内容已体现在快照里，跳过启动时的全量写盘
+        if applied:
             try:
-                n_in = input("请输入要生成的名字数量 n（回车使用默认20000）：").strip()
-                q_in = input("请输入要执行的查询次数 q（回车使用默认200）：").strip()
-                n = int(n_in) if n_in else 20000
-                q = int(q_in) if q_in else 200
+                self._persist_state()
             except Exception:
-                print("输入无效，使用默认参数 n=20000, q=200")
-                n, q = 20000, 200
-            bench_trie(n=n, q=q)
-        elif choice == "6":
-            print("再见！")
-
-            break
-        else:
-            print("输入错误，请重新输入。")
-            
+                pass
 
  # ----------------- Trie 性能基准工具 -----------------
-def _random_name(min_len=3, max_len=10):
-    return "".join(random.choices(string.ascii_lowercase, k=random.randint(min_len, max_len)))
+def _random_name(rng, min_len=3, max_len=10, _letters=string.ascii_lowercase):
+    return "".join(rng.choices(_letters, k=rng.randint(min_len, max_len)))
 
 def bench_trie(n=20000, q=200, seed=42):
     """在内存中对 Trie 与朴素 startswith 做插入/查询/删除性能对比。"""
-    random.seed(seed)
-    names = [_random_name() for _ in range(n)]
+    # 独立 Random 实例 + 绑定局部方法：避免模块级 random 每次调用的
+    # 属性查找开销污染数据生成阶段（n 较大时甚至超过被测部分）
+    rng = random.Random(seed)
+    names = [_random_name(rng) for _ in range(n)]
 
     trie = Trie()
 
@@ -674,7 +922,7 @@ def bench_trie(n=20000, q=200, seed=42):
     t_insert_trie = time.perf_counter() - t0
 
     # 生成用于查询的随机前缀
-    prefixes = [names[random.randrange(n)][: random.randint(1, 4)] for _ in range(q)]
+    prefixes = [names[rng.randrange(n)][: rng.randint(1, 4)] for _ in range(q)]
 
     # trie 前缀查询基准
     t0 = time.perf_counter()
@@ -682,13 +930,29 @@ def bench_trie(n=20000, q=200, seed=42):
         _ = trie.search_prefix(p)
     t_query_trie = time.perf_counter() - t0
 
-    # 朴素循环扫描前缀查询基准
-    t0 = time.perf_counter()
-    for p in prefixes:
-        for name in names:
-            if name.startswith(p):
-                pass
-    t_query_naive = time.perf_counter() - t0
+    # 线性扫描前缀查询基准。numpy 可用时整体向量化：
+    # 名字是纯 ASCII，定宽填充为 uint8 矩阵后比较前 k 列即可，
+    # 单次查询从 n 次解释器循环变成一次 SIMD 比较
+    if np is not None:
+        width = max(len(s) for s in names) if names else 1
+        name_mat = np.zeros((n, width), dtype=np.uint8)
+        for i, s in enumerate(names):
+            b = s.encode("ascii")
+            name_mat[i, : len(b)] = np.frombuffer(b, dtype=np.uint8)
+        t0 = time.perf_counter()
+        for p in prefixes:
+            pv = np.frombuffer(p.encode("ascii"), dtype=np.uint8)
+            _ = np.nonzero((name_mat[:, : len(pv)] == pv).all(axis=1))[0]
+        t_query_naive = time.perf_counter() - t0
+        naive_label = "numpy 向量化扫描"
+    else:
+        t0 = time.perf_counter()
+        for p in prefixes:
+            for name in names:
+                if name.startswith(p):
+                    pass
+        t_query_naive = time.perf_counter() - t0
+        naive_label = "朴素扫描"
 
     # trie 删除基准测试
     t0 = time.perf_counter()
@@ -702,6 +966,124 @@ def bench_trie(n=20000, q=200, seed=42):
     print("\nTrie 性能基准结果：")
     print(f"  items: {n}, queries: {q}")
     print(f"  插入 - trie: {ms(t_insert_trie)}")
-    print(f"  前缀查询 - trie: {ms(t_query_trie)}, 朴素扫描: {ms(t_query_naive)}")
+    print(f"  前缀查询 - trie: {ms(t_query_trie)}, {naive_label}: {ms(t_query_naive)}")
     print(f"  删除 - trie: {ms(t_delete_trie)}")
     
+
+
+# ----------------- 交互入口 -----------------
+# 菜单分发表：哈希一次取处理函数，代替逐项字符串比较的 if/elif 链；
+# 处理函数定义在模块尾部的基准工具之后，修掉了原先先进循环、
+# 选 7 才发现 bench_trie 尚未定义的 NameError
+def _menu_add(cl):
+    name = input("请输入联系人姓名：")
+    phone_number = input("请输入联系人电话：")
+    remark = input("请输入备注（可选,不输入默认空白）：")
+    cl.add_contact(name, phone_number, remark)
+
+
+def _print_contact_row(i, c):
+    print(f"{i}. 名称: {c.get('name')}, 电话: {c.get('phone_number')}, 备注: {c.get('remark')}")
+
+
+def _menu_find(cl):
+    print("查找方式：1. 按全名  2. 按姓名前缀  3. 按手机号后缀")
+    mode = input("请选择查找方式(1/2/3)：").strip()
+    if mode == "1":
+        name = input("请输入要查找的联系人姓名：")
+        contact = cl.search_contact(name)
+        if contact:
+            print(f"找到联系人：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 备注: {contact.get('remark')}")
+        else:
+            print("该联系人不存在")
+    elif mode == "2":
+        prefix = input("请输入姓名前缀：")
+        results = cl.search_by_prefix(prefix)
+        if not results:
+            print("未找到匹配的联系人。")
+        else:
+            for i, c in enumerate(results, start=1):
+                _print_contact_row(i, c)
+    elif mode == "3":
+        suffix = input("请输入手机号后缀（例如尾号）：")
+        results = cl.search_by_phone_suffix(suffix)
+        if not results:
+            print("未找到匹配的联系人。")
+        else:
+            for i, c in enumerate(results, start=1):
+                _print_contact_row(i, c)
+    else:
+        print("无效的查找方式。")
+
+
+def _menu_delete(cl):
+    name = input("请输入联系人姓名：")
+    cl.delete_contact(name)
+
+
+def _menu_edit(cl):
+    name = input("请输入联系人姓名：")
+    contact = cl.search_contact(name)
+    if not contact:
+        print("该联系人不存在")
+        return
+    print(f"当前信息：名称: {contact.get('name')}, 电话: {contact.get('phone_number')}, 备注: {contact.get('remark')}")
+    new_name = input("请输入新的姓名（回车保留不变）：").strip() or None
+    new_phone = input("请输入新的电话（回车保留不变）：").strip() or None
+    new_remark = input("请输入新的备注（回车保留不变）：").strip() or None
+    cl.edit_contact(name, new_name, new_phone, new_remark)
+
+
+def _menu_list(cl):
+    cl.list_contacts()
+
+
+def _menu_bench(cl):
+    try:
+        n_in = input("请输入要生成的名字数量 n（回车使用默认20000）：").strip()
+        q_in = input("请输入要执行的查询次数 q（回车使用默认200）：").strip()
+        n = int(n_in) if n_in else 20000
+        q = int(q_in) if q_in else 200
+    except Exception:
+        print("输入无效，使用默认参数 n=20000, q=200")
+        n, q = 20000, 200
+    bench_trie(n=n, q=q)
+
+
+def _menu_unknown(cl):
+    print("输入错误，请重新输入。")
+
+
+_MENU_HANDLERS = {
+    "1": _menu_add,
+    "2": _menu_find,
+    "3": _menu_delete,
+    "4": _menu_edit,
+    "5": _menu_list,
+    "7": _menu_bench,
+}
+
+# 菜单文本在导入期拼好，循环里一次 print 完成
+_MENU_TEXT = "\n".join((
+    "",
+    "通讯录存储与检索系统",
+    "1. 添加联系人",
+    "2. 查找联系人",
+    "3. 删除联系人",
+    "4. 修改联系人信息",
+    "5. 列出所有联系人",
+    "6. 退出系统",
+    "7. Trie 性能基准测试",
+))
+
+
+if __name__ == "__main__":
+    cl = ContactList()
+    while True:
+        print(_MENU_TEXT)
+        choice = input("请选择操作选项：")
+        if choice == "6":
+            cl.close()
+            print("再见！")
+            break
+        _MENU_HANDLERS.get(choice, _menu_unknown)(cl)
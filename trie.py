@@ -1,62 +1,195 @@
+import sys
+from array import array
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# 批量前缀下钻的编译版本：竞技场布局的 children 就是一块连续
+# int32 缓冲，逐字符下钻在 numba 下跑成原生循环，省掉每步的
+# 字节码分派。numba/numpy 任一缺席时该符号为 None，批量接口
+# 退回纯 Python 逐条查询
+if njit is not None and np is not None:
+    @njit(cache=True)
+    def _descend_batch(children, buf, offsets, out):
+        for m in range(offsets.shape[0] - 1):
+            v = 0
+            for k in range(offsets[m], offsets[m + 1]):
+                i = buf[k] - 97
+                if i < 0 or i >= 26:
+                    v = -1
+                    break
+                c = children[v * 26 + i]
+                if c < 0:
+                    v = -1
+                    break
+                v = c
+            out[m] = v
+else:
+    _descend_batch = None
+
+
 # 前缀索引（按联系人姓名），索引使用联系人唯一整数 id
 class TrieNode:
+    # 固定槽位省掉每节点的实例 __dict__；子表用定长数组 + 位图 +
+    # 溢出字典：a-z 小写按 ord(char)-97 直接取下标，位图记录占用
+    # 槽位（空判断是一次整数比较），中文等其他字符退回懒创建的
+    # extra 字典
+    __slots__ = ("children", "extra", "bitmap", "is_end_of_name", "contact_ids")
+
     def __init__(self):
-        self.children = {}
+        self.children = [None] * 26
+        self.extra = None
+        self.bitmap = 0
         self.is_end_of_name = False
         # 存储联系人 id 集合，避免姓名重复导致索引冲突
         self.contact_ids = set()
 
+    def get_child(self, char: str):
+        i = ord(char) - 97
+        if 0 <= i < 26:
+            return self.children[i]
+        return self.extra.get(char) if self.extra else None
+
+    def set_child(self, char: str, node: "TrieNode"):
+        i = ord(char) - 97
+        if 0 <= i < 26:
+            self.children[i] = node
+            self.bitmap |= 1 << i
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[char] = node
+
+    def del_child(self, char: str):
+        i = ord(char) - 97
+        if 0 <= i < 26:
+            self.children[i] = None
+            self.bitmap &= ~(1 << i)
+        elif self.extra:
+            self.extra.pop(char, None)
+
+    def has_children(self) -> bool:
+        return self.bitmap != 0 or bool(self.extra)
+
 
 class Trie:
     def __init__(self):
         self.root = TrieNode()
 
     def insert(self, name: str, contact_id: int):
-        """将联系人姓名插入前缀树，使用 contact_id 作为标识。"""
+        """将联系人姓名插入前缀树，使用 contact_id 作为标识。
+
+        键在入树前做一次 casefold 归一化：树只是索引，原始拼写仍
+        留在联系人记录上，"Al" 就能命中 "alice"，也不必为每种大小
+        写各插一份。intern 让同一折叠串全程只存一个实例。
+        """
+        name = sys.intern(name.casefold())
         node = self.root
         for char in name:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
+            child = node.get_child(char)
+            if child is None:
+                child = TrieNode()
+                node.set_child(char, child)
+            node = child
             node.contact_ids.add(contact_id)
         node.is_end_of_name = True
 
     def search_prefix(self, prefix: str) -> set:
-        """返回与前缀匹配的联系人 id 集合（可能为空）。"""
+        """返回与前缀匹配的联系人 id 集合（可能为空）。
+
+        直接返回节点持有的集合，只读约定：调用方只应迭代，不得
+        修改——省掉每次查询 O(|命中|) 的防御性拷贝。
+
+        前缀按与 insert 相同的 casefold 归一化，大小写不敏感。
+        """
+        prefix = sys.intern(prefix.casefold())
         node = self.root
         for char in prefix:
-            if char not in node.children:
+            node = node.get_child(char)
+            if node is None:
                 return set()
-            node = node.children[char]
-        return set(node.contact_ids)
+        return node.contact_ids
 
     def delete(self, name: str, contact_id: int):
-        """从前缀树中删除联系人 id 的索引引用。"""
-        def _delete(node: TrieNode, name: str, depth: int) -> bool:
-            if depth == len(name):
-                if node.is_end_of_name:
-                    node.is_end_of_name = False
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_name
-            char = name[depth]
-            if char in node.children:
-                should_delete_child = _delete(node.children[char], name, depth + 1)
-                if should_delete_child:
-                    del node.children[char]
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_name
-            return False
-
-        _delete(self.root, name, 0)
+        """从前缀树中删除联系人 id 的索引引用（迭代两段式）。
+
+        先沿路径下钻并记录 (父节点, 字符)，再自底向上清 id、摘除
+        空节点；语义与原递归版一致，但不再为每个字符付一个 Python
+        栈帧与闭包单元的代价。键与 insert 同样做 casefold 归一化。
+        """
+        name = name.casefold()
+        node = self.root
+        path = []
+        for char in name:
+            child = node.get_child(char)
+            if child is None:
+                # 路径中途断开：已匹配的上层节点仍要清掉 id
+                # （断开处的节点本身除外，与递归版行为一致）
+                for parent, _ in path:
+                    parent.contact_ids.discard(contact_id)
+                return
+            path.append((node, char))
+            node = child
+        if node.is_end_of_name:
+            node.is_end_of_name = False
+        node.contact_ids.discard(contact_id)
+        prune = not node.has_children() and not node.is_end_of_name
+        for parent, char in reversed(path):
+            if prune:
+                parent.del_child(char)
+            parent.contact_ids.discard(contact_id)
+            prune = not parent.has_children() and not parent.is_end_of_name
 
 # 后缀索引（按联系人电话）
 class SuffixTrieNode:
+    # 电话的字母表基本只有 '0'-'9'：数字孩子放定长数组，按
+    # ord(char)-48 直接取下标，下钻一层零哈希；位图记录占用槽位，
+    # 偶发的 '+'/'-' 等字符退回 extra 字典（懒创建，纯数字号码不分配）
+    __slots__ = ("children", "extra", "bitmap", "is_end_of_phone", "contact_ids")
+
     def __init__(self):
-        self.children = {}
+        self.children = [None] * 10
+        self.extra = None
+        self.bitmap = 0
         self.is_end_of_phone = False
         # 存储联系人 id 集合，避免不同联系人同名或同号冲突
         self.contact_ids = set()
 
+    def get_child(self, char: str):
+        i = ord(char) - 48
+        if 0 <= i <= 9:
+            return self.children[i]
+        return self.extra.get(char) if self.extra else None
+
+    def set_child(self, char: str, node: "SuffixTrieNode"):
+        i = ord(char) - 48
+        if 0 <= i <= 9:
+            self.children[i] = node
+            self.bitmap |= 1 << i
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[char] = node
+
+    def del_child(self, char: str):
+        i = ord(char) - 48
+        if 0 <= i <= 9:
+            self.children[i] = None
+            self.bitmap &= ~(1 << i)
+        elif self.extra:
+            self.extra.pop(char, None)
+
+    def has_children(self) -> bool:
+        return self.bitmap != 0 or bool(self.extra)
+
 
 class SuffixTrie:
     def __init__(self):
@@ -66,36 +199,236 @@ class SuffixTrie:
         """将联系人电话插入后缀树，使用 contact_id 作为标识。"""
         node = self.root
         for char in reversed(phone):
-            if char not in node.children:
-                node.children[char] = SuffixTrieNode()
-            node = node.children[char]
+            child = node.get_child(char)
+            if child is None:
+                child = SuffixTrieNode()
+                node.set_child(char, child)
+            node = child
             node.contact_ids.add(contact_id)
         node.is_end_of_phone = True
 
     def search_suffix(self, suffix: str) -> set:
-        """返回与后缀匹配的联系人 id 集合（可能为空）。"""
+        """返回与后缀匹配的联系人 id 集合（可能为空）。
+
+        与 Trie.search_prefix 相同的只读约定：返回活集合不拷贝。
+        """
         node = self.root
         for char in reversed(suffix):
-            if char not in node.children:
+            node = node.get_child(char)
+            if node is None:
                 return set()
-            node = node.children[char]
-        return set(node.contact_ids)
+        return node.contact_ids
 
     def delete(self, phone: str, contact_id: int):
-        """从后缀树中删除联系人 id 的索引引用。"""
-        def _delete(node: SuffixTrieNode, phone: str, depth: int) -> bool:
-            if depth == len(phone):
-                if node.is_end_of_phone:
-                    node.is_end_of_phone = False
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_phone
-            char = phone[len(phone) - 1 - depth]
-            if char in node.children:
-                should_delete_child = _delete(node.children[char], phone, depth + 1)
-                if should_delete_child:
-                    del node.children[char]
-                node.contact_ids.discard(contact_id)
-                return len(node.children) == 0 and not node.is_end_of_phone
-            return False
-
-        _delete(self.root, phone, 0)
\ No newline at end of file
+        """从后缀树中删除联系人 id 的索引引用（迭代两段式）。"""
+        node = self.root
+        path = []
+        for char in reversed(phone):
+            child = node.get_child(char)
+            if child is None:
+                # 路径中途断开：已匹配的上层节点仍要清掉 id
+                for parent, _ in path:
+                    parent.contact_ids.discard(contact_id)
+                return
+            path.append((node, char))
+            node = child
+        if node.is_end_of_phone:
+            node.is_end_of_phone = False
+        node.contact_ids.discard(contact_id)
+        prune = not node.has_children() and not node.is_end_of_phone
+        for parent, char in reversed(path):
+            if prune:
+                parent.del_child(char)
+            parent.contact_ids.discard(contact_id)
+            prune = not parent.has_children() and not parent.is_end_of_phone
+
+
+# 扁平化竞技场布局的前缀树：与 Trie 同接口，但没有逐节点 Python
+# 对象。所有节点共享几个平行数组，节点即整数下标，下钻是对连续
+# 内存的定长偏移访问而非跨堆的指针追逐
+class ArenaTrie:
+    """竞技场（arena）版名字前缀树。
+
+    节点 v 的 26 个小写子槽位于 children[v*26 : (v+1)*26]
+    （array('i') 32 位下标，-1 表示缺位），位图/词尾标志/ids 各占
+    一个平行数组；a-z 之外的字符走按节点分组的 _extra 字典。
+    删除只清引用不回收行，树在大量删除后可调用 compact() 按 BFS
+    重排——同一层的节点重新排到连续下标上，顺带回收死行。
+    """
+
+    __slots__ = ("children", "bitmap", "is_end", "ids", "_extra", "_n")
+
+    _FANOUT = 26
+
+    def __init__(self):
+        self.children = array("i")
+        self.bitmap = array("L")
+        self.is_end = bytearray()
+        self.ids = []
+        self._extra = {}
+        self._n = 0
+        self._new_node()
+
+    def _new_node(self) -> int:
+        v = self._n
+        self._n += 1
+        self.children.extend([-1] * self._FANOUT)
+        self.bitmap.append(0)
+        self.is_end.append(0)
+        self.ids.append(set())
+        return v
+
+    def _get_child(self, v: int, char: str):
+        i = ord(char) - 97
+        if 0 <= i < 26:
+            c = self.children[v * 26 + i]
+            return c if c >= 0 else None
+        kids = self._extra.get(v)
+        return kids.get(char) if kids else None
+
+    def insert(self, name: str, contact_id: int):
+        """将联系人姓名插入前缀树，使用 contact_id 作为标识。
+
+        与 Trie 一致，键做 casefold 归一化，前缀查询大小写不敏感。
+        """
+        name = sys.intern(name.casefold())
+        children = self.children
+        v = 0
+        for char in name:
+            i = ord(char) - 97
+            if 0 <= i < 26:
+                slot = v * 26 + i
+                c = children[slot]
+                if c < 0:
+                    c = self._new_node()
+                    children[slot] = c
+                    self.bitmap[v] |= 1 << i
+            else:
+                kids = self._extra.get(v)
+                c = kids.get(char) if kids else None
+                if c is None:
+                    c = self._new_node()
+                    if kids is None:
+                        kids = self._extra[v] = {}
+                    kids[char] = c
+            v = c
+            self.ids[v].add(contact_id)
+        self.is_end[v] = 1
+
+    def search_prefix(self, prefix: str) -> set:
+        """返回与前缀匹配的联系人 id 集合（可能为空，只读约定不拷贝）。"""
+        prefix = prefix.casefold()
+        v = 0
+        for char in prefix:
+            v = self._get_child(v, char)
+            if v is None:
+                return set()
+        return self.ids[v]
+
+    def bulk_search_prefix(self, prefixes):
+        """批量前缀查询，返回与 prefixes 一一对应的 id 集合列表。
+
+        纯小写字母的前缀编码进一块 uint8 缓冲 + 偏移表，一次编译
+        调用完成全部下钻（见 _descend_batch）；带中文等其他字符的
+        前缀要走 _extra 字典，仍逐条用 search_prefix 处理。没有
+        numba/numpy 时整体退回逐条查询，结果完全一致。
+        """
+        if _descend_batch is None:
+            return [self.search_prefix(p) for p in prefixes]
+        results = [None] * len(prefixes)
+        idx = []
+        parts = []
+        offs = [0]
+        total = 0
+        for j, p in enumerate(prefixes):
+            p = p.casefold()
+            if p and p.isascii() and p.isalpha() and p.islower():
+                idx.append(j)
+                parts.append(p)
+                total += len(p)
+                offs.append(total)
+            else:
+                results[j] = self.search_prefix(p)
+        if idx:
+            buf = np.frombuffer("".join(parts).encode("ascii"), dtype=np.uint8)
+            offsets = np.asarray(offs, dtype=np.int32)
+            children = np.frombuffer(self.children, dtype=np.int32)
+            out = np.empty(len(idx), dtype=np.int64)
+            _descend_batch(children, buf, offsets, out)
+            ids = self.ids
+            for k, j in enumerate(idx):
+                v = out[k]
+                results[j] = ids[v] if v >= 0 else set()
+        return results
+
+    def delete(self, name: str, contact_id: int):
+        """从前缀树中删除联系人 id 的索引引用（迭代两段式）。"""
+        name = name.casefold()
+        v = 0
+        path = []
+        for char in name:
+            c = self._get_child(v, char)
+            if c is None:
+                # 路径中途断开（同名联系人删除时可能已摘除下层节点），
+                # 仍需把 id 从已匹配的上层节点中清掉
+                for _, _, matched in path[:-1]:
+                    self.ids[matched].discard(contact_id)
+                return
+            path.append((v, char, c))
+            v = c
+        if self.is_end[v]:
+            self.is_end[v] = 0
+        prune = True
+        for parent, char, child in reversed(path):
+            self.ids[child].discard(contact_id)
+            if (prune and self.bitmap[child] == 0
+                    and child not in self._extra and not self.is_end[child]):
+                i = ord(char) - 97
+                if 0 <= i < 26:
+                    self.children[parent * 26 + i] = -1
+                    self.bitmap[parent] &= ~(1 << i)
+                else:
+                    kids = self._extra.get(parent)
+                    if kids:
+                        kids.pop(char, None)
+                        if not kids:
+                            del self._extra[parent]
+            else:
+                prune = False
+
+    def compact(self):
+        """按 BFS 重建竞技场：回收删除留下的死行，并让同层节点
+        排到连续下标上，改善下钻时的缓存局部性。"""
+        old_children = self.children
+        old_is_end = self.is_end
+        old_ids = self.ids
+        old_extra = self._extra
+
+        self.children = array("i")
+        self.bitmap = array("L")
+        self.is_end = bytearray()
+        self.ids = []
+        self._extra = {}
+        self._n = 0
+        self._new_node()
+
+        queue = deque([(0, 0)])  # (旧下标, 新下标)
+        while queue:
+            ov, nv = queue.popleft()
+            self.is_end[nv] = old_is_end[ov]
+            self.ids[nv] = old_ids[ov]
+            base = ov * self._FANOUT
+            for i in range(self._FANOUT):
+                oc = old_children[base + i]
+                if oc >= 0:
+                    nc = self._new_node()
+                    self.children[nv * self._FANOUT + i] = nc
+                    self.bitmap[nv] |= 1 << i
+                    queue.append((oc, nc))
+            kids = old_extra.get(ov)
+            if kids:
+                new_kids = self._extra[nv] = {}
+                for char, oc in kids.items():
+                    nc = self._new_node()
+                    new_kids[char] = nc
+                    queue.append((oc, nc))